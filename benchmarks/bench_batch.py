@@ -0,0 +1,50 @@
+# benchmarks/bench_batch.py
+
+# Compare adding tasks one CLI call at a time against one batch command
+
+# Requires
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import make_dataset
+from lib.utils import storage
+
+MAIN = os.path.abspath("main.py")
+
+
+def run(task_count=10_000, single_calls=20):
+    with tempfile.TemporaryDirectory() as directory:
+        users_file, projects_file, tasks_file = make_dataset(directory, 100, 1_000, 10_000)
+        with open(os.path.join(directory, "settings.json"), "w") as file:
+            json.dump({"user_file": users_file, "project_file": projects_file, "task_file": tasks_file}, file)
+        project_ids = [project["id"] for project in storage.load_data(projects_file)]
+        commands = [
+            ["add-task", "--project-id", project_ids[i % len(project_ids)], "--title", f"Batch task {i}"]
+            for i in range(task_count)
+        ]
+
+        # Separate processes, timed for a sample and scaled up
+        start = time.perf_counter()
+        for command in commands[:single_calls]:
+            subprocess.run([sys.executable, MAIN, *command], cwd=directory, capture_output=True, check=True)
+        per_call = (time.perf_counter() - start) / single_calls
+
+        # One batch process reading JSON operations from stdin
+        operations = "".join(
+            json.dumps({"command": command[0], "project_id": command[2], "title": command[4]}) + "\n"
+            for command in commands
+        )
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN, "batch"], cwd=directory, input=operations, capture_output=True, text=True, check=True)
+        batch = time.perf_counter() - start
+
+        print(f"{task_count} add-task operations")
+        print(f"{'separate calls (s)':>20} {per_call * task_count:>10.1f}  (estimated from {single_calls} calls)")
+        print(f"{'batch (s)':>20} {batch:>10.1f}  ({task_count / batch:.0f} operations/s)")
+
+
+if __name__ == "__main__":
+    run()
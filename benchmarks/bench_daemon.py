@@ -0,0 +1,67 @@
+# benchmarks/bench_daemon.py
+
+# Compare running commands directly against sending them to a daemon
+
+# Requires
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import make_dataset
+from lib.utils import storage
+
+MAIN = os.path.abspath("main.py")
+
+
+# Run a command against the data in a directory, returning seconds taken
+def run_command(directory, *command):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAIN, *command], cwd=directory, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+# Average time of the same commands run several times
+def average(directory, commands, repeat):
+    return sum(run_command(directory, *command) for command in commands * repeat) / (len(commands) * repeat)
+
+
+def run(task_count=100_000, repeat=10):
+    with tempfile.TemporaryDirectory() as directory:
+        users_file, projects_file, tasks_file = make_dataset(directory, 1_000, 10_000, task_count)
+        with open(os.path.join(directory, "settings.json"), "w") as file:
+            json.dump({
+                "user_file": users_file,
+                "project_file": projects_file,
+                "task_file": tasks_file,
+                "daemon_socket": os.path.join(directory, "pm.sock")
+            }, file)
+        task_id = storage.load_data(tasks_file)[0]["id"]
+        user_email = storage.load_data(users_file)[0]["email"]
+        commands = [
+            ["get-task", "--id", task_id],
+            ["--format", "json", "get-user", "--email", user_email],
+            ["update-task", "--id", task_id, "--status", "completed"],
+        ]
+
+        direct = average(directory, commands, repeat)
+
+        # Start a daemon and wait for its socket
+        daemon = subprocess.Popen([sys.executable, MAIN, "daemon"], cwd=directory, stdout=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(os.path.join(directory, "pm.sock")):
+                time.sleep(0.05)
+            served = average(directory, commands, repeat)
+        finally:
+            daemon.send_signal(signal.SIGTERM)
+            daemon.wait()
+
+        print(f"{task_count} tasks, average per command")
+        print(f"{'direct (ms)':>12} {direct * 1000:>10.1f}")
+        print(f"{'daemon (ms)':>12} {served * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,53 @@
+# benchmarks/bench_export.py
+
+# Compare the export command against one get-user call per user,
+# and check that exporting holds no more than a little extra memory
+
+# Requires
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from benchmarks.common import make_dataset, quiet
+from lib.controllers.users_controller import UsersController
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.utils import commands
+
+
+def run(user_count=1_000, project_count=10_000, task_count=200_000):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_dataset(directory, user_count, project_count, task_count)
+        controllers = [UsersController(paths[0]), ProjectsController(paths[1]), TasksController(paths[2])]
+        users_controller, projects_controller, tasks_controller = controllers
+        for controller in controllers:
+            controller.data
+        print(f"{user_count} users, {project_count} projects, {task_count} tasks")
+
+        # One get-user per user, as the nightly export does today
+        start = time.perf_counter()
+        with quiet():
+            for user in users_controller.data:
+                users_controller.get_user({"id": user._id, "format": "jsonl"}, projects_controller, tasks_controller)
+        print(f"{'get-user per user (s)':>24} {time.perf_counter() - start:>8.2f}")
+
+        # Export to a file, then again while tracking memory allocated during the export
+        for output_format in ["jsonl", "csv"]:
+            path = os.path.join(directory, f"export.{output_format}")
+            args = argparse.Namespace(command="export", output_format=output_format, file=path)
+            with quiet(), contextlib.redirect_stderr(io.StringIO()):
+                start = time.perf_counter()
+                count = commands.dispatch(args, *controllers)
+                elapsed = time.perf_counter() - start
+                tracemalloc.start()
+                commands.dispatch(args, *controllers)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            print(f"{'export ' + output_format + ' (s)':>24} {elapsed:>8.2f}  ({count / elapsed:.0f} rows/s, peak {peak / 1024:.0f} KiB, {os.path.getsize(path) / 1e6:.0f} MB)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,26 @@
+# benchmarks/bench_formats.py
+
+# Compare save time, load time and file size for each storage format
+
+# Requires
+import tempfile
+import os
+from benchmarks.common import make_records, timed
+from lib.utils import storage
+
+
+def run(record_counts=(100_000, 1_000_000)):
+    print(f"{'tasks':>10} {'format':>8} {'save (s)':>9} {'load (s)':>9} {'size (MB)':>10}")
+    for task_count in record_counts:
+        tasks = make_records(1, 1, task_count)[2]
+        with tempfile.TemporaryDirectory() as directory:
+            for data_format in storage.FORMATS:
+                path = os.path.join(directory, f"tasks.{data_format}")
+                save_time = timed(storage.save_data, path, tasks, data_format)
+                load_time = timed(storage.load_data, path)
+                size = os.path.getsize(path) / 1_000_000
+                print(f"{task_count:>10} {data_format:>8} {save_time:>9.3f} {load_time:>9.3f} {size:>10.1f}")
+
+
+if __name__ == "__main__":
+    run()
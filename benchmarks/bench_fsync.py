@@ -0,0 +1,40 @@
+# benchmarks/bench_fsync.py
+
+# Compare saving three data files one at a time against one group commit
+# Each file is written to a synced temp file and renamed into place. Saving
+# separately syncs the directory after every rename, while the group commit
+# renames all three files and syncs the directory once.
+
+# Requires
+import tempfile
+import os
+from benchmarks.common import make_records, timed
+from lib.utils import storage
+
+
+# Save each file with its own commit
+def save_separately(paths, datasets):
+    for path, records in zip(paths, datasets):
+        storage.save_data(path, records)
+
+
+# Save all files in one group commit
+def save_grouped(paths, datasets):
+    with storage.group_commit():
+        for path, records in zip(paths, datasets):
+            storage.save_data(path, records)
+
+
+def run(record_counts=(10, 1_000, 10_000), repeats=20):
+    print(f"{'tasks':>10} {'per-file (ms)':>14} {'grouped (ms)':>13}")
+    for task_count in record_counts:
+        datasets = make_records(max(task_count // 100, 1), max(task_count // 10, 1), task_count)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f"{name}.json") for name in ("users", "projects", "tasks")]
+            separate = sum(timed(save_separately, paths, datasets) for _ in range(repeats)) / repeats
+            grouped = sum(timed(save_grouped, paths, datasets) for _ in range(repeats)) / repeats
+        print(f"{task_count:>10} {separate * 1000:>14.2f} {grouped * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+# benchmarks/bench_ids.py
+
+# Compare IDs held as integers against the same code keeping UUID strings
+# (ids.parse and ids.text patched to pass text through) for memory after
+# loading, load time, ID lookups, foreign key scans and the first page of a
+# paged listing
+
+# Requires
+import contextlib
+import gc
+import tempfile
+import tracemalloc
+import uuid
+from benchmarks.common import make_dataset, timed
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.models import ids
+
+
+# Keep IDs as the strings read from the data files
+@contextlib.contextmanager
+def text_ids():
+    saved = ids.parse, ids.text, ids.new_id
+    ids.parse = ids.text = lambda value: value
+    ids.new_id = lambda: str(uuid.uuid4())
+    try:
+        yield
+    finally:
+        ids.parse, ids.text, ids.new_id = saved
+
+
+# Load projects and tasks, returning the memory they hold and the load time
+def load(projects_file, tasks_file):
+    gc.collect()
+    tracemalloc.start()
+    projects, tasks = ProjectsController(projects_file), TasksController(tasks_file, columnar=False)
+    projects.data, tasks.data
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del projects, tasks
+    gc.collect()
+
+    projects, tasks = ProjectsController(projects_file), TasksController(tasks_file, columnar=False)
+    seconds = timed(lambda: (projects.data, tasks.data))
+    return memory, seconds, projects, tasks
+
+
+def run(task_count=500_000, project_count=10_000):
+    with tempfile.TemporaryDirectory() as directory:
+        users_file, projects_file, tasks_file = make_dataset(directory, 1_000, project_count, task_count)
+        print(f"{task_count} tasks in {project_count} projects")
+        print(f"{'ids':>5} {'memory (MB)':>12} {'per task (B)':>13} {'load (s)':>9} {'lookups (s)':>12} {'scans (s)':>10} {'first page (s)':>15}")
+        for name, mode in [("text", text_ids), ("int", contextlib.nullcontext)]:
+            with mode():
+                memory, seconds, projects, tasks = load(projects_file, tasks_file)
+                task_ids = [task._id for task in tasks.data]
+                project_ids = [project._id for project in projects.data[:100]]
+
+                # Index lookups by ID, a scan comparing every task's project ID
+                # for each of 100 projects, and sorting IDs for the first page
+                lookups = timed(lambda: [tasks._index[task_id] for task_id in task_ids])
+                scans = timed(lambda: [[task for task in tasks.data if task.project_id == project_id] for project_id in project_ids])
+                first_page = timed(tasks.page, 50)
+            print(f"{name:>5} {memory / 1e6:>12.0f} {memory / task_count:>13.0f} {seconds:>9.2f} {lookups:>12.3f} {scans:>10.3f} {first_page:>15.3f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+# benchmarks/bench_import.py
+
+# Measure bulk import throughput in rows per second, including the save
+
+# Requires
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from benchmarks.common import make_records, quiet
+from lib.controllers.users_controller import UsersController
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.utils import commands, storage
+
+
+# Write rows as CSV or JSON Lines depending on the file extension
+def write_rows(path, rows):
+    with open(path, "w", newline="") as file:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            file.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+def run(row_count=100_000):
+    users, projects, tasks = make_records(row_count, row_count, row_count)
+    print(f"{'command':>16} {'rows':>8} {'seconds':>8} {'rows/s':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = {
+            "import-users": os.path.join(directory, "users.csv"),
+            "import-projects": os.path.join(directory, "projects.jsonl"),
+            "import-tasks": os.path.join(directory, "tasks.csv"),
+        }
+        for (command, path), rows in zip(inputs.items(), [users, projects, tasks]):
+            write_rows(path, rows)
+
+        controllers = [
+            UsersController(os.path.join(directory, "users.json")),
+            ProjectsController(os.path.join(directory, "projects.json")),
+            TasksController(os.path.join(directory, "tasks.json")),
+        ]
+        for command, path in inputs.items():
+            start = time.perf_counter()
+            with quiet(), storage.group_commit():
+                commands.dispatch(argparse.Namespace(command=command, file=path, input_format=None, errors=None), *controllers)
+                for controller in controllers:
+                    controller.flush()
+            elapsed = time.perf_counter() - start
+            print(f"{command:>16} {row_count:>8} {elapsed:>8.2f} {row_count / elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    run()
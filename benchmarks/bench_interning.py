@@ -0,0 +1,62 @@
+# benchmarks/bench_interning.py
+
+# Measure memory and load time for projects and tasks with repeated values
+# shared on load (one object per project ID, owner ID and status) against
+# loading every row's values separately, plus scans comparing those values
+
+# Requires
+import contextlib
+import gc
+import tempfile
+import tracemalloc
+from benchmarks.common import make_dataset, timed
+from lib.controllers.base_controller import BaseController
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.models.status import Status
+
+
+# Load each row's foreign keys and status as separate objects
+@contextlib.contextmanager
+def separate_values():
+    share, parse = BaseController._share, Status.parse
+    BaseController._share = lambda self, row, shared: row
+    Status.parse = staticmethod(lambda value: value)
+    try:
+        yield
+    finally:
+        BaseController._share, Status.parse = share, parse
+
+
+# Memory held by the loaded projects and tasks, and the time to load them
+def load(projects_file, tasks_file):
+    gc.collect()
+    tracemalloc.start()
+    projects, tasks = ProjectsController(projects_file), TasksController(tasks_file, columnar=False)
+    projects.data, tasks.data
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del projects, tasks
+    gc.collect()
+
+    projects, tasks = ProjectsController(projects_file), TasksController(tasks_file, columnar=False)
+    seconds = timed(lambda: (projects.data, tasks.data))
+    return memory, seconds, projects, tasks
+
+
+def run(task_count=500_000, project_count=50_000):
+    with tempfile.TemporaryDirectory() as directory:
+        users_file, projects_file, tasks_file = make_dataset(directory, 1_000, project_count, task_count)
+        print(f"{task_count} tasks in {project_count} projects")
+        print(f"{'values':>9} {'memory (MB)':>12} {'per record (B)':>15} {'load (s)':>9} {'status scan (s)':>16} {'project scans (s)':>18}")
+        for name, mode in [("separate", separate_values), ("shared", contextlib.nullcontext)]:
+            with mode():
+                memory, seconds, projects, tasks = load(projects_file, tasks_file)
+                project_ids = [project._id for project in projects.data[:100]]
+                status_scan = timed(lambda: sum(task.status == "completed" for task in tasks.data))
+                project_scans = timed(lambda: [[task for task in tasks.data if task.project_id == project_id] for project_id in project_ids])
+            print(f"{name:>9} {memory / 1e6:>12.0f} {memory / (task_count + project_count):>15.0f} {seconds:>9.2f} {status_scan:>16.3f} {project_scans:>18.3f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,35 @@
+# benchmarks/bench_list_views.py
+
+# Time list-projects and list-tasks at growing sizes
+# Owner names and project titles come from one lookup table per call,
+# so the time per row should stay flat as the data grows.
+
+# Requires
+import tempfile
+from benchmarks.common import make_dataset, timed, quiet
+from lib.controllers.users_controller import UsersController
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+
+
+def run(sizes=(1_000, 10_000, 50_000)):
+    print(f"{'tasks':>10} {'projects':>10} {'list-projects (s)':>18} {'list-tasks (s)':>15} {'us/task':>8}")
+    for task_count in sizes:
+        project_count = max(task_count // 10, 1)
+        user_count = max(project_count // 10, 1)
+        with tempfile.TemporaryDirectory() as directory:
+            users_file, projects_file, tasks_file = make_dataset(directory, user_count, project_count, task_count)
+            with UsersController(users_file) as users_controller, \
+                    ProjectsController(projects_file) as projects_controller, \
+                    TasksController(tasks_file) as tasks_controller:
+                # Load files before timing the listings
+                users_controller.data, projects_controller.data, tasks_controller.data
+                with quiet():
+                    projects_time = timed(projects_controller.list_projects, users_controller)
+                    tasks_time = timed(tasks_controller.list_tasks, projects_controller)
+        per_task = tasks_time / task_count * 1_000_000
+        print(f"{task_count:>10} {project_count:>10} {projects_time:>18.3f} {tasks_time:>15.3f} {per_task:>8.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,53 @@
+# benchmarks/bench_models.py
+
+# Measure memory per model instance with tracemalloc, comparing the slotted
+# models against the same classes built without __slots__
+
+# Requires
+import inspect
+import tracemalloc
+from benchmarks.common import make_records
+from lib.models import person, project, task, user
+
+
+# Rebuild a model module's classes from its source without the __slots__ lines
+def unslotted(module, namespace=None):
+    namespace = dict(namespace or {})
+    source = inspect.getsource(module)
+    lines = [
+        line for line in source.splitlines()
+        if "__slots__" not in line and not line.startswith("from lib.models.person")
+    ]
+    exec(compile("\n".join(lines), module.__file__, "exec"), namespace)
+    return namespace
+
+
+# Bytes allocated per instance when creating records from dictionaries
+def bytes_per_record(model, rows):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [model.from_dict(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the records is not part of their size
+    return (after - before) / len(records) - 8
+
+
+def run(count=100_000):
+    users, projects, tasks = make_records(count, count, count)
+    plain_person = unslotted(person)
+    plain = {
+        "User": (unslotted(user, plain_person)["User"], user.User, users),
+        "Project": (unslotted(project)["Project"], project.Project, projects),
+        "Task": (unslotted(task)["Task"], task.Task, tasks),
+    }
+
+    print(f"{'model':>8} {'dict (B)':>10} {'slots (B)':>10} {'saved':>7}")
+    for name, (before_model, after_model, rows) in plain.items():
+        before = bytes_per_record(before_model, rows)
+        after = bytes_per_record(after_model, rows)
+        print(f"{name:>8} {before:>10.0f} {after:>10.0f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,27 @@
+# benchmarks/bench_output.py
+
+# Compare list-tasks rendering time for each output format
+
+# Requires
+import tempfile
+from benchmarks.common import make_dataset, timed, quiet
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.utils import output
+
+
+def run(task_count=100_000):
+    print(f"{'format':>8} {'list-tasks (s)':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        users_file, projects_file, tasks_file = make_dataset(directory, 100, 1_000, task_count)
+        with ProjectsController(projects_file) as projects_controller, TasksController(tasks_file) as tasks_controller:
+            # Load files before timing the listings
+            projects_controller.data, tasks_controller.data
+            for output_format in output.FORMATS:
+                with quiet():
+                    elapsed = timed(tasks_controller.list_tasks, projects_controller, {"format": output_format})
+                print(f"{output_format:>8} {elapsed:>15.3f}")
+
+
+if __name__ == "__main__":
+    run()
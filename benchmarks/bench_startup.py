@@ -0,0 +1,53 @@
+# benchmarks/bench_startup.py
+
+# Time CLI startup for commands that do little work besides importing modules,
+# and how long building the argument parser takes for every command
+
+# Requires
+import subprocess
+import sys
+import time
+from lib.utils.args import COMMANDS, create_parser
+
+
+COMMANDS_TO_RUN = [
+    ["--help"],
+    ["--format", "json", "list-users"],
+    ["list-users"],
+]
+
+
+# Best wall time of a few runs of a CLI command in milliseconds
+def best_run(command, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", *command], capture_output=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+# Average time to build a parser in milliseconds
+def parser_time(argv, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        create_parser(argv)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(repeat=10):
+    print(f"{'command':>28} {'best (ms)':>10}")
+    for command in COMMANDS_TO_RUN:
+        print(f"{' '.join(command):>28} {best_run(command, repeat):>10.1f}")
+
+    # Building every subparser versus only the invoked one, and each command's help
+    print(f"\n{'command':>16} {'all parsers (ms)':>17} {'one parser (ms)':>16} {'--help run (ms)':>16}")
+    for name in COMMANDS:
+        eager = parser_time(None, repeat * 10)
+        lazy = parser_time([name], repeat * 10)
+        print(f"{name:>16} {eager:>17.3f} {lazy:>16.3f} {best_run([name, '--help'], repeat):>16.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,43 @@
+# benchmarks/bench_task_store.py
+
+# Compare the Task object list against the column store for loading,
+# memory, the filter and count operations and one page of a status filter
+
+# Requires
+import gc
+import tempfile
+import tracemalloc
+from benchmarks.common import make_dataset, timed
+from lib.controllers.tasks_controller import TasksController
+
+
+def run(task_count=1_000_000):
+    with tempfile.TemporaryDirectory() as directory:
+        users_file, projects_file, tasks_file = make_dataset(directory, 100, 10_000, task_count)
+        print(f"{task_count} tasks in 10000 projects")
+        print(f"{'store':>8} {'load (s)':>9} {'memory (MB)':>12} {'counts (s)':>11} {'by status (s)':>14} {'status page (s)':>16} {'by project (s)':>15}")
+        for columnar in [False, True]:
+            # Memory still held after loading the tasks and their indexes
+            controller = TasksController(tasks_file, columnar=columnar)
+            tracemalloc.start()
+            controller.data
+            memory = tracemalloc.get_traced_memory()[0] / 1e6
+            tracemalloc.stop()
+            del controller
+            gc.collect()
+
+            # Load time without tracing
+            controller = TasksController(tasks_file, columnar=columnar)
+            load = timed(lambda: controller.data)
+
+            project_id = controller.data[0].project_id if not columnar else controller.data.project_ids[0]
+            counts = timed(controller.status_counts)
+            by_status = timed(controller.filter_tasks, status="completed")
+            status_page = timed(controller.filter_page, status="completed", limit=50)
+            by_project = timed(lambda: [controller.filter_tasks(project_id=project_id) for _ in range(1_000)])
+            name = "columns" if columnar else "objects"
+            print(f"{name:>8} {load:>9.2f} {memory:>12.0f} {counts:>11.3f} {by_status:>14.3f} {status_page:>16.3f} {by_project:>15.3f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+# benchmarks/common.py
+
+# Shared helpers for the benchmark scripts
+# Run a benchmark from the project root, e.g. python -m benchmarks.bench_list_views
+
+# Requires
+import contextlib
+import io
+import os
+import time
+import uuid
+from lib.utils import storage
+
+
+# Build synthetic users, projects and tasks as plain dictionaries
+def make_records(user_count, project_count, task_count):
+    users = [
+        {"id": str(uuid.uuid4()), "name": f"User {i}", "email": f"user{i}@example.com"}
+        for i in range(user_count)
+    ]
+    projects = [
+        {
+            "id": str(uuid.uuid4()),
+            "assigned_to_id": users[i % user_count]["id"],
+            "title": f"Project {i}",
+            "description": f"Description {i}",
+            "due_date": "12-31-2030",
+            "status": "active" if i % 2 else "completed"
+        }
+        for i in range(project_count)
+    ]
+    tasks = [
+        {
+            "id": str(uuid.uuid4()),
+            "project_id": projects[i % project_count]["id"],
+            "title": f"Task {i}",
+            "status": "active" if i % 3 else "completed"
+        }
+        for i in range(task_count)
+    ]
+    return users, projects, tasks
+
+
+# Write synthetic data files into a directory and return their paths
+def make_dataset(directory, user_count, project_count, task_count):
+    users, projects, tasks = make_records(user_count, project_count, task_count)
+    paths = []
+    for name, records in [("users", users), ("projects", projects), ("tasks", tasks)]:
+        path = os.path.join(directory, f"{name}.json")
+        storage.save_data(path, records)
+        paths.append(path)
+    return paths
+
+
+# Time a function call in seconds
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+# Silence console output while a benchmark runs
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
@@ -0,0 +1,283 @@
+# lib/controllers/base_controller.py
+
+# Shared loading, saving and change tracking for the controllers
+
+# Requires
+from bisect import bisect_right, insort
+from lib.models import ids
+from lib.utils import storage
+from lib.utils.console import console
+
+
+class BaseController:
+    # Model class and storage table set by each controller
+    model = None
+    table = None
+
+    # Fields indexed for lookups of related records
+    foreign_keys = ()
+
+    # Larger batches of ID lookups load all data instead of reading records one by one
+    batch_lookup_limit = 100
+
+    def __init__(self, file_path, backend=None):
+        self.file_path = file_path
+        self.backend = backend or storage.get_backend()
+        self._data = None
+        self._index = {}
+        self._foreign = {field: {} for field in self.foreign_keys}
+        self._order = None
+        self.saved = False
+        # Changed IDs kept in insertion order (dict keys as ordered sets)
+        self._added = {}
+        self._updated = {}
+        self._deleted = {}
+
+
+    # Open controller (data is loaded on first access)
+    def __enter__(self):
+        return self
+
+
+    # Save data only if something changed
+    def __exit__(self, exc_type, exc_value, ex_tb):
+        self.flush()
+
+
+    # Load data from storage the first time it is needed
+    @property
+    def data(self):
+        if self._data is None:
+            self._load()
+        return self._data
+
+
+    # Read all records from storage and index them by ID
+    def _load(self):
+        index = {}
+        shared = {}
+        for row in self.backend.load(self):
+            record = self.model.from_dict(self._share(row, shared))
+            if record._id not in self._deleted:
+                index[record._id] = self._index.get(record._id) or record
+
+        # Keep records fetched or added before the full load
+        for record in self._index.values():
+            index.setdefault(record._id, record)
+
+        self._data = list(index.values())
+        self._index = index
+        self._order = None
+        self._foreign = {field: {} for field in self.foreign_keys}
+        for record in self._data:
+            self._link(record)
+
+
+    # Replace a row's foreign keys with values shared by every row that refers to the same record
+    # Each distinct ID is parsed once, and records hold one object per ID instead of a copy each
+    def _share(self, row, shared):
+        for field in self.foreign_keys:
+            value = row.get(field)
+            key = shared.get(value)
+            if key is None:
+                key = shared[value] = ids.parse(value)
+            row[field] = key
+        return row
+
+
+    # Turn a stored row into a record, reusing one already in memory
+    def _cache(self, row):
+        record = self._index.get(ids.parse(row["id"]))
+        if record is None:
+            record = self.model.from_dict(row)
+            self._index[record._id] = record
+        return record
+
+
+    # Cache rows from a targeted query and return in-memory records that match
+    def _match(self, rows, test):
+        for row in rows:
+            if ids.parse(row["id"]) not in self._deleted:
+                self._cache(row)
+        return [record for record in self._index.values() if test(record)]
+
+
+    # Add record to the foreign key indexes
+    def _link(self, record):
+        for field, index in self._foreign.items():
+            index.setdefault(getattr(record, field), []).append(record)
+
+
+    # Remove record from the foreign key indexes
+    def _unlink(self, record):
+        for field, index in self._foreign.items():
+            records = index.get(getattr(record, field), [])
+            if record in records:
+                records.remove(record)
+
+
+    # Print a validation error, returning whether the value was valid
+    @staticmethod
+    def _report(error):
+        if error:
+            console.print(f"[red]✗ Error:[/red] {error}")
+        return not error
+
+
+    # Read a field of an imported row as text
+    @staticmethod
+    def _value(row, field):
+        value = row.get(field)
+        return "" if value is None else str(value)
+
+
+    # Check that an imported record's ID is not already taken
+    def _check_new_id(self, record_id):
+        if record_id and ids.parse(record_id) in self._index:
+            return f"ID {record_id} already exists."
+        return None
+
+
+    # Find a record by ID, given as text or in its in-memory form
+    def find_by_id(self, record_id):
+        record_id = ids.parse(record_id)
+        if self._data is None:
+            # Backends that support it fetch just this record
+            if not self.backend.partial:
+                self._load()
+            elif record_id not in self._index and record_id not in self._deleted:
+                row = self.backend.get(self, ids.text(record_id))
+                if row is storage.NOT_INDEXED:
+                    self._load()
+                elif row:
+                    self._cache(row)
+        return self._index.get(record_id)
+
+
+    # Find several records by ID, returning a dictionary of those found
+    def find_many(self, record_ids):
+        if self._data is None and len(record_ids) > self.batch_lookup_limit:
+            self._load()
+        records = {}
+        for record_id in record_ids:
+            record = self.find_by_id(record_id)
+            if record:
+                records[record_id] = record
+        return records
+
+
+    # Get one page of records ordered by ID and the cursor for the next page
+    # Records can be narrowed to a filtered list first
+    # IDs are ordered and compared as text, matching the order of earlier pages
+    def page(self, limit=None, after=None, records=None):
+        # Without paging options, list everything in stored order
+        if limit is None and after is None:
+            return (self.data if records is None else records), None
+
+        # Filtered records are sorted by ID just for this page
+        if records is not None:
+            records = sorted((record for record in records if after is None or record.id > after), key=lambda record: record.id)
+            page_records = records[:limit] if limit else records
+            next_cursor = page_records[-1].id if limit and len(records) > limit else None
+            return page_records, next_cursor
+
+        # Backends with an ordered ID index return just the page
+        if self._data is None and self.backend.queries:
+            fetch = limit + 1 + len(self._deleted) if limit else None
+            for row in self.backend.page(self, after, fetch):
+                if ids.parse(row["id"]) not in self._deleted:
+                    self._cache(row)
+            record_ids = ids.sort(record_id for record_id in self._index if after is None or ids.text(record_id) > after)
+        else:
+            if self._order is None:
+                self._order = ids.sort(record._id for record in self.data)
+            start = bisect_right(self._order, after, key=ids.text) if after is not None else 0
+            record_ids = self._order[start:start + limit + 1] if limit else self._order[start:]
+
+        page_ids = record_ids[:limit] if limit else record_ids
+        next_cursor = ids.text(page_ids[-1]) if limit and len(record_ids) > limit else None
+        return [self._index[record_id] for record_id in page_ids], next_cursor
+
+
+    # Find all records whose foreign key field matches a value
+    def find_by(self, field, value):
+        value = ids.parse(value)
+        if self._data is None:
+            if self.backend.queries:
+                rows = self.backend.query(self, field, ids.text(value))
+                return self._match(rows, lambda record: getattr(record, field) == value)
+            self._load()
+        return list(self._foreign[field].get(value, []))
+
+
+    # Check if data has been read from storage
+    @property
+    def loaded(self):
+        return self._data is not None
+
+
+    # Check for unsaved changes
+    @property
+    def dirty(self):
+        return bool(self._added or self._updated or self._deleted)
+
+
+    # Get added records, updated records and deleted IDs for the storage backend
+    def pending_changes(self):
+        added = [self._index[record_id] for record_id in self._added]
+        updated = [self._index[record_id] for record_id in self._updated]
+        return added, updated, [ids.text(record_id) for record_id in self._deleted]
+
+
+    # Write changes to storage if dirty
+    # Changes stay marked until the group commit holding them is in place,
+    # so a failed save leaves them to be written again
+    def flush(self):
+        if not self.dirty:
+            return False
+
+        self.backend.save(self)
+        storage.after_commit(self._mark_saved)
+        return True
+
+
+    # Forget the changes once they are written
+    def _mark_saved(self):
+        self._added.clear()
+        self._updated.clear()
+        self._deleted.clear()
+        self.saved = True
+
+
+    # Add a new record
+    def _insert(self, record):
+        if self._data is not None:
+            self._data.append(record)
+        self._index[record._id] = record
+        self._link(record)
+        if self._order is not None:
+            insort(self._order, record._id, key=ids.text)
+        self._added[record._id] = None
+
+
+    # Mark an existing record as changed
+    def _touch(self, record):
+        if record._id not in self._added:
+            self._updated[record._id] = None
+
+
+    # Remove a record
+    def _remove(self, record):
+        if self._data is not None:
+            self._data.remove(record)
+        del self._index[record._id]
+        self._unlink(record)
+        if self._order is not None:
+            self._order.pop(bisect_right(self._order, record.id, key=ids.text) - 1)
+        self._updated.pop(record._id, None)
+
+        # Records added in this session were never written
+        if record._id in self._added:
+            del self._added[record._id]
+        else:
+            self._deleted[record._id] = None
@@ -2,92 +2,95 @@
 
 # Requires
 from lib.models.project import Project
-from lib.utils import storage
-from rich.console import Console
-from rich.table import Table
-from rich import box
+from lib.models.status import Status
+from lib.controllers.base_controller import BaseController
+from lib.utils import output
+from lib.utils.console import console, new_table
 from datetime import datetime
 
-# Console instance
-console = Console()
 
+class ProjectsController(BaseController):
+    model = Project
+    table = "projects"
+    foreign_keys = ("assigned_to_id",)
 
-class ProjectsController:
-    def __init__(self, file_path):
-        self.file_path = file_path
-        self.data = []
 
-
-    # Load data
-    def __enter__(self):
-        self.data = [Project.from_dict(project) for project in storage.load_data(self.file_path)]
-        return self
- 
-
-    # Save data
-    def __exit__(self, exc_type, exc_value, ex_tb):
-        storage.save_data(self.file_path, [project.to_dict() for project in self.data])
-    
-
-    # Validate title
+    # Check title, returning an error message if it is invalid
     @staticmethod
-    def _validate_title(title):
+    def _check_title(title):
         # Check not empty
         if not title.strip():
-            console.print("[red]✗ Error:[/red] Title cannot be empty.")
-            return False
+            return "Title cannot be empty."
         
-        return True
+        return None
 
 
-    # Validate description
+    # Check description, returning an error message if it is invalid
     @staticmethod
-    def _validate_description(description):
+    def _check_description(description):
         # Check not empty
         if not description.strip():
-            console.print("[red]✗ Error:[/red] Description cannot be empty.")
-            return False
+            return "Description cannot be empty."
         
-        return True
+        return None
 
 
-    # Validate date
+    # Check date, returning an error message if it is invalid
     @staticmethod
-    def _validate_date(due_date):
+    def _check_date(due_date):
         # Check not empty
         if not due_date.strip():
-            console.print("[red]✗ Error:[/red] Due date cannot be empty.")
-            return False
+            return "Due date cannot be empty."
         
         # Check format MM-DD-YYYY
         try:
             parsed_date = datetime.strptime(due_date, "%m-%d-%Y")
         except ValueError:
-            console.print("[red]✗ Error:[/red] Due date must be in MM-DD-YYYY format.")
-            return False
+            return "Due date must be in MM-DD-YYYY format."
         
         # Check date is in the future
         if parsed_date.date() < datetime.today().date():
-            console.print("[red]✗ Error:[/red] Due date must be in the future.")
-            return False
+            return "Due date must be in the future."
         
-        return True
+        return None
 
 
-    # Validate status
+    # Check status, returning an error message if it is invalid
     @staticmethod
-    def _validate_status(status):
+    def _check_status(status):
         # Check not empty
         if not status.strip():
-            console.print("[red]✗ Error:[/red] Status cannot be empty.")
-            return False
+            return "Status cannot be empty."
         
         # Check valid values
         if status.lower() not in ["active", "completed"]:
-            console.print("[red]✗ Error:[/red] Status must be 'active' or 'completed'.")
-            return False
+            return "Status must be 'active' or 'completed'."
         
-        return True
+        return None
+
+
+    # Validate title
+    @staticmethod
+    def _validate_title(title):
+        return ProjectsController._report(ProjectsController._check_title(title))
+
+
+    # Validate description
+    @staticmethod
+    def _validate_description(description):
+        return ProjectsController._report(ProjectsController._check_description(description))
+
+
+    # Validate date
+    @staticmethod
+    def _validate_date(due_date):
+        return ProjectsController._report(ProjectsController._check_date(due_date))
+
+
+    # Validate status
+    @staticmethod
+    def _validate_status(status):
+        return ProjectsController._report(ProjectsController._check_status(status))
 
 
     # Add project
@@ -105,7 +108,7 @@ class ProjectsController:
             return None
         
         # Check if user exists
-        user = next((u for u in users_controller.data if u._id == args["assigned_to_id"]), None)
+        user = users_controller.find_by_id(args["assigned_to_id"])
         if not user:
             console.print(f"[red]✗ Error:[/red] User with ID {args['assigned_to_id']} not found.")
             return None
@@ -117,13 +120,13 @@ class ProjectsController:
             description=args["description"],
             due_date=args["due_date"]
         )
-        self.data.append(project)
-        console.print(f"[green]✓ Success:[/green] Project '{project.title}' added successfully with ID: {project._id}.")
+        self._insert(project)
+        console.print(f"[green]✓ Success:[/green] Project '{project.title}' added successfully with ID: {project.id}.")
         return project
 
     # Get project by ID with owner and tasks
     def get_project(self, args, users_controller=None, tasks_controller=None):
-        project = next((p for p in self.data if p._id == args["id"]), None)
+        project = self.find_by_id(args["id"])
         
         # Project not found
         if not project:
@@ -133,7 +136,16 @@ class ProjectsController:
         # Look up assigned user
         user = None
         if users_controller:
-            user = next((u for u in users_controller.data if u._id == project.assigned_to_id), None)
+            user = users_controller.find_by_id(project.assigned_to_id)
+        
+        # Machine-readable output includes the owner name and tasks
+        output_format = args.get("format", "table")
+        if output_format != "table":
+            record = {**project.to_dict(), "assigned_to": user.name if user else "Unknown"}
+            if tasks_controller:
+                record["tasks"] = [task.to_dict() for task in tasks_controller.find_by("project_id", project._id)]
+            output.write_records([record], output_format)
+            return project
         
         # Format status with color
         status_color = "orange1" if project.status == "active" else "blue"
@@ -143,7 +155,7 @@ class ProjectsController:
         console.print(f"Description: {project.description}")
         console.print(f"Status: [{status_color}]{project.status}[/{status_color}] | Due: {project.due_date}")
         console.print(f"Assigned to: {user.name if user else 'Unknown'}")
-        console.print(f"ID: {project._id}\n")
+        console.print(f"ID: {project.id}\n")
         console.rule()
         
         # If no tasks controller provided, just show project info
@@ -151,7 +163,7 @@ class ProjectsController:
             return project
         
         # Find tasks for this project
-        project_tasks = [t for t in tasks_controller.data if t.project_id == project._id]
+        project_tasks = tasks_controller.find_by("project_id", project._id)
         
         if not project_tasks:
             console.print("[yellow]⚠ Warning:[/yellow] No tasks found for this project.")
@@ -159,7 +171,7 @@ class ProjectsController:
         
         # Create task table
         console.print("\n[bold]Tasks:[/bold]\n")
-        task_table = Table(box=box.SIMPLE, show_header=True)
+        task_table = new_table()
         task_table.add_column("ID", style="cyan", justify="center")
         task_table.add_column("Title", style="white")
         task_table.add_column("Status", justify="center")
@@ -171,7 +183,7 @@ class ProjectsController:
             else:
                 status_display = "[blue]completed[/blue]"
             
-            task_table.add_row(task._id, task.title, status_display)
+            task_table.add_row(task.id, task.title, status_display)
         
         console.print(task_table)
         console.rule()
@@ -180,14 +192,44 @@ class ProjectsController:
 
 
     # List projects
-    def list_projects(self, users_controller):
+    def list_projects(self, users_controller, args=None):
+        args = args or {}
+        projects, next_cursor = self.page(args.get("limit"), args.get("after"))
+        output_format = args.get("format", "table")
+        
         # Check if there are any projects
-        if not self.data:
+        if not projects and output_format == "table":
             console.print("[yellow]⚠ Warning:[/yellow] No projects found.")
-            return
+            return []
+        
+        # Build owner name lookup once for all rows
+        owners = users_controller.find_many({project.assigned_to_id for project in projects})
+        user_names = {user_id: user.name for user_id, user in owners.items()}
+        
+        # Stream machine-readable output without building a table
+        if output_format != "table":
+            output.write_records(
+                ({**project.to_dict(), "assigned_to": user_names.get(project.assigned_to_id, "Unknown")} for project in projects),
+                output_format
+            )
+            if next_cursor:
+                output.write_next_page(next_cursor)
+            return projects
+        
+        # Stream large tables row by row instead of building them with rich
+        if len(projects) > output.STREAM_THRESHOLD:
+            output.stream_table(
+                "All Projects",
+                ["ID", "Title", "Assigned To", "Status", "Due Date"],
+                ((project.id, project.title, user_names.get(project.assigned_to_id, "Unknown"), project.status, project.due_date)
+                 for project in projects)
+            )
+            if next_cursor:
+                print(f"Next page: --after {next_cursor}")
+            return projects
         
         # Create table
-        table = Table(title="All Projects", box=box.SIMPLE)
+        table = new_table("All Projects")
         table.add_column("ID", style="cyan", justify="center")
         table.add_column("Title", style="white")
         table.add_column("Assigned To", style="white")
@@ -195,10 +237,8 @@ class ProjectsController:
         table.add_column("Due Date", style="white", justify="center")
         
         # Add rows
-        for project in self.data:
-            # Look up assigned user
-            user = next((u for u in users_controller.data if u._id == project.assigned_to_id), None)
-            assigned_to = user.name if user else "Unknown"
+        for project in projects:
+            assigned_to = user_names.get(project.assigned_to_id, "Unknown")
             
             # Color-code status
             if project.status == "active":
@@ -206,14 +246,19 @@ class ProjectsController:
             else:
                 status_display = "[blue]completed[/blue]"
             
-            table.add_row(project._id, project.title, assigned_to, status_display, project.due_date)
+            table.add_row(project.id, project.title, assigned_to, status_display, project.due_date)
         
         console.print(table)
+        
+        # Show cursor for the next page
+        if next_cursor:
+            console.print(f"Next page: --after {next_cursor}")
+        return projects
 
 
     # Update project
     def update_project(self, args):
-        project = next((p for p in self.data if p._id == args["id"]), None)
+        project = self.find_by_id(args["id"])
         
         if not project:
             console.print(f"[red]✗ Error:[/red] Project with ID {args['id']} not found.")
@@ -247,15 +292,18 @@ class ProjectsController:
         if "due_date" in args:
             project.due_date = args["due_date"]
         if "status" in args:
-            project.status = args["status"]
+            project.status = Status.parse(args["status"])
         
+        # Mark project as changed
+        self._touch(project)
+
         console.print(f"[green]✓ Success:[/green] Project '{project.title}' updated successfully.")
         return project
     
 
     # Delete project
     def delete_project(self, args):
-        project = next((p for p in self.data if p._id == args["id"]), None)
+        project = self.find_by_id(args["id"])
         
         # Check if project exists
         if not project:
@@ -263,12 +311,47 @@ class ProjectsController:
             return None
         
         # Ask for confirmation
-        confirm = input(f"Are you sure you want to delete project '{project.title}' (ID: {project._id})? (y/n): ")
+        confirm = input(f"Are you sure you want to delete project '{project.title}' (ID: {project.id})? (y/n): ")
         if confirm.lower() != "y":
             console.print("[yellow]⚠ Warning:[/yellow] Delete cancelled.")
             return None
         
         # If confirmed, delete the project
-        self.data.remove(project)
+        self._remove(project)
         console.print(f"[green]✓ Success:[/green] Project '{project.title}' deleted successfully.")
-        return project
\ No newline at end of file
+        return project
+
+
+    # Import projects in bulk, collecting rejected rows instead of printing errors
+    def import_projects(self, rows, rejected, users_controller):
+        # Load both files once so the ID checks below are dictionary lookups
+        self.data, users_controller.data
+        imported = []
+        for line_number, row in rows:
+            assigned_to_id = self._value(row, "assigned_to_id")
+            title, description = self._value(row, "title"), self._value(row, "description")
+            due_date, status = self._value(row, "due_date"), self._value(row, "status") or "active"
+            project_id = self._value(row, "id") or None
+            error = (
+                self._check_title(title)
+                or self._check_description(description)
+                or self._check_date(due_date)
+                or self._check_status(status)
+                or self._check_new_id(project_id)
+                or (None if users_controller.find_by_id(assigned_to_id) else f"User with ID {assigned_to_id} not found.")
+            )
+            if error:
+                rejected.append((line_number, row, error))
+                continue
+            
+            project = Project(
+                assigned_to_id=assigned_to_id,
+                title=title,
+                description=description,
+                due_date=due_date,
+                status=status,
+                project_id=project_id
+            )
+            self._insert(project)
+            imported.append(project)
+        return imported
\ No newline at end of file
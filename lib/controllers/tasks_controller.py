@@ -1,62 +1,128 @@
 # lib/controllers/tasks_controller.py
 
 # Requires
+from lib.models import ids
 from lib.models.task import Task
-from lib.utils import storage
-from rich.console import Console
-from rich.table import Table
-from rich import box
+from lib.models.status import Status
+from lib.models.task_store import TaskStore
+from lib.controllers.base_controller import BaseController
+from lib.utils import output, storage
+from lib.utils.console import console, new_table
 
-# Console instance
-console = Console()
 
+class TasksController(BaseController):
+    model = Task
+    table = "tasks"
+    foreign_keys = ("project_id",)
 
-class TasksController:
-    def __init__(self, file_path):
-        self.file_path = file_path
-        self.data = []
+    def __init__(self, file_path, backend=None, columnar=None):
+        super().__init__(file_path, backend)
+        # Keep loaded tasks in columns instead of one object each
+        if columnar is None:
+            columnar = storage.get_settings("task_store", "objects") == "columns"
+        self.columnar = columnar
 
 
-    # Load data
-    def __enter__(self):
-        self.data = [Task.from_dict(task) for task in storage.load_data(self.file_path)]
-        return self
- 
+    # Load tasks into a column store when enabled
+    def _load(self):
+        if not self.columnar:
+            super()._load()
+            return
+        
+        shared = {}
+        store = TaskStore.from_dicts(self._share(row, shared) for row in self.backend.load(self) if not self._deleted or ids.parse(row["id"]) not in self._deleted)
+        
+        # Keep tasks fetched or added before the full load
+        for task in self._index.values():
+            store.append(task)
+        
+        # The store's ID index and project lists replace the usual indexes
+        self._data = store
+        self._index = store.index
+        self._order = None
+        self._foreign = {}
 
-    # Save data
-    def __exit__(self, exc_type, exc_value, ex_tb):
-        storage.save_data(self.file_path, [task.to_dict() for task in self.data])
-    
 
-    # Validate title
+    # Find tasks by project, from the column store when enabled
+    def find_by(self, field, value):
+        if self.columnar and (self.loaded or not self.backend.queries):
+            return self.data.filter(**{field: ids.parse(value)})
+        return super().find_by(field, value)
+
+
+    # Find tasks with a status and/or in a project
+    def filter_tasks(self, status=None, project_id=None):
+        if self.columnar:
+            return self.data.filter(status, ids.parse(project_id))
+        tasks = self.find_by("project_id", project_id) if project_id is not None else self.data
+        return [task for task in tasks if status is None or task.status == status]
+
+
+    # Get one page of the tasks with a status and/or in a project
+    # The column store filters and pages row numbers, creating views only for the page
+    def filter_page(self, status=None, project_id=None, limit=None, after=None):
+        if self.columnar:
+            return self.data.page(self.data.filter_rows(status, ids.parse(project_id)), limit, after)
+        return self.page(limit, after, self.filter_tasks(status, project_id))
+
+
+    # Count tasks per status
+    def status_counts(self):
+        if self.columnar:
+            return self.data.status_counts()
+        counts = {}
+        for task in self.data:
+            counts[task.status] = counts.get(task.status, 0) + 1
+        return counts
+
+
+    # Check title, returning an error message if it is invalid
     @staticmethod
-    def _validate_title(title):
+    def _check_title(title):
         # Check not empty
         if not title.strip():
-            console.print("─" * 60, style="dim")
-            console.print("[red]✗ Error:[/red] Title cannot be empty.")
-            console.print("─" * 60, style="dim")
-            return False
+            return "Title cannot be empty."
         
-        return True
+        return None
 
 
-    # Validate status
+    # Check status, returning an error message if it is invalid
     @staticmethod
-    def _validate_status(status):
+    def _check_status(status):
         # Check not empty
         if not status.strip():
-            console.print("─" * 60, style="dim")
-            console.print("[red]✗ Error:[/red] Status cannot be empty.")
-            console.print("─" * 60, style="dim")
-            return False
+            return "Status cannot be empty."
         
         # Check valid values
         if status.lower() not in ["active", "completed"]:
-            console.print("[red]✗ Error:[/red] Status must be 'active' or 'completed'.")
-            return False
+            return "Status must be 'active' or 'completed'."
         
-        return True
+        return None
+
+
+    # Print an empty-field error between rules so it stands out
+    @staticmethod
+    def _report_empty(error):
+        console.print("─" * 60, style="dim")
+        console.print(f"[red]✗ Error:[/red] {error}")
+        console.print("─" * 60, style="dim")
+        return False
+
+
+    # Validate title
+    @staticmethod
+    def _validate_title(title):
+        error = TasksController._check_title(title)
+        return TasksController._report_empty(error) if error else True
+
+
+    # Validate status
+    @staticmethod
+    def _validate_status(status):
+        error = TasksController._check_status(status)
+        if error and not status.strip():
+            return TasksController._report_empty(error)
+        return TasksController._report(error)
 
 
     # Add task
@@ -66,7 +132,7 @@ class TasksController:
             return None
         
         # Check if project exists
-        project = next((p for p in projects_controller.data if p._id == args["project_id"]), None)
+        project = projects_controller.find_by_id(args["project_id"])
         if not project:
             console.print(f"[red]✗ Error:[/red] Project with ID {args['project_id']} not found.")
             return None
@@ -76,14 +142,16 @@ class TasksController:
             project_id=args["project_id"],
             title=args["title"]
         )
-        self.data.append(task)
-        console.print(f"[green]✓ Success:[/green] Task '{task.title}' added successfully with ID: {task._id}.")
+        self._insert(task)
+        # A column store copies the task into a row, so return the row's view
+        task = self._index[task._id]
+        console.print(f"[green]✓ Success:[/green] Task '{task.title}' added successfully with ID: {task.id}.")
         return task
 
 
     # Get task by ID
     def get_task(self, args, projects_controller):
-        task = next((t for t in self.data if t._id == args["id"]), None)
+        task = self.find_by_id(args["id"])
         
         # Task not found
         if not task:
@@ -91,36 +159,74 @@ class TasksController:
             return None
         
         # Look up project name
-        project = next((p for p in projects_controller.data if p._id == task.project_id), None)
+        project = projects_controller.find_by_id(task.project_id)
         project_name = project.title if project else "Unknown"
         
+        # Machine-readable output
+        output_format = args.get("format", "table")
+        if output_format != "table":
+            output.write_records([{**task.to_dict(), "project": project_name}], output_format)
+            return task
+        
         # Format status with color
         status_color = "orange1" if task.status == "active" else "blue"
         
         # Task found
-        console.print(f"ID: {task._id}, Title: {task.title}, Project: {project_name}, Status: [{status_color}]{task.status}[/{status_color}]")
+        console.print(f"ID: {task.id}, Title: {task.title}, Project: {project_name}, Status: [{status_color}]{task.status}[/{status_color}]")
         return task
 
 
     # List tasks
-    def list_tasks(self, projects_controller):
+    def list_tasks(self, projects_controller, args=None):
+        args = args or {}
+        output_format = args.get("format", "table")
+        
+        # Filter before paging so pages hold only matching tasks
+        if args.get("status") or args.get("project_id"):
+            tasks, next_cursor = self.filter_page(args.get("status"), args.get("project_id"), args.get("limit"), args.get("after"))
+        else:
+            tasks, next_cursor = self.page(args.get("limit"), args.get("after"))
+        
         # Check if there are any tasks
-        if not self.data:
+        if not tasks and output_format == "table":
             console.print("[yellow]⚠ Warning:[/yellow] No tasks found.")
-            return
+            return []
+        
+        # Build project title lookup once for all rows
+        projects = projects_controller.find_many({task.project_id for task in tasks})
+        project_titles = {project_id: project.title for project_id, project in projects.items()}
+        
+        # Stream machine-readable output without building a table
+        if output_format != "table":
+            output.write_records(
+                ({**task.to_dict(), "project": project_titles.get(task.project_id, "Unknown")} for task in tasks),
+                output_format
+            )
+            if next_cursor:
+                output.write_next_page(next_cursor)
+            return tasks
+        
+        # Stream large tables row by row instead of building them with rich
+        if len(tasks) > output.STREAM_THRESHOLD:
+            output.stream_table(
+                "All Tasks",
+                ["ID", "Title", "Project", "Status"],
+                ((task.id, task.title, project_titles.get(task.project_id, "Unknown"), task.status) for task in tasks)
+            )
+            if next_cursor:
+                print(f"Next page: --after {next_cursor}")
+            return tasks
         
         # Create table
-        table = Table(title="All Tasks", box=box.SIMPLE)
+        table = new_table("All Tasks")
         table.add_column("ID", style="cyan", justify="center")
         table.add_column("Title", style="white")
         table.add_column("Project", style="white")
         table.add_column("Status", justify="center")
         
         # Add rows
-        for task in self.data:
-            # Look up project name
-            project = next((p for p in projects_controller.data if p._id == task.project_id), None)
-            project_name = project.title if project else "Unknown"
+        for task in tasks:
+            project_name = project_titles.get(task.project_id, "Unknown")
             
             # Color-code status
             if task.status == "active":
@@ -128,14 +234,19 @@ class TasksController:
             else:
                 status_display = "[blue]completed[/blue]"
             
-            table.add_row(task._id, task.title, project_name, status_display)
+            table.add_row(task.id, task.title, project_name, status_display)
         
         console.print(table)
+        
+        # Show cursor for the next page
+        if next_cursor:
+            console.print(f"Next page: --after {next_cursor}")
+        return tasks
 
 
     # Update task
     def update_task(self, args):
-        task = next((t for t in self.data if t._id == args["id"]), None)
+        task = self.find_by_id(args["id"])
         
         if not task:
             console.print(f"[red]✗ Error:[/red] Task with ID {args['id']} not found.")
@@ -155,15 +266,18 @@ class TasksController:
         if "title" in args:
             task.title = args["title"]
         if "status" in args:
-            task.status = args["status"]
+            task.status = Status.parse(args["status"])
         
+        # Mark task as changed
+        self._touch(task)
+
         console.print(f"[green]✓ Success:[/green] Task '{task.title}' updated successfully.")
         return task
     
 
     # Delete task
     def delete_task(self, args):
-        task = next((t for t in self.data if t._id == args["id"]), None)
+        task = self.find_by_id(args["id"])
         
         # Check if task exists
         if not task:
@@ -171,12 +285,59 @@ class TasksController:
             return None
         
         # Ask for confirmation
-        confirm = input(f"Are you sure you want to delete task '{task.title}' (ID: {task._id})? (y/n): ")
+        confirm = input(f"Are you sure you want to delete task '{task.title}' (ID: {task.id})? (y/n): ")
         if confirm.lower() != "y":
             console.print("[yellow]⚠ Warning:[/yellow] Delete cancelled.")
             return None
         
         # If confirmed, delete the task
-        self.data.remove(task)
+        self._remove(task)
         console.print(f"[green]✓ Success:[/green] Task '{task.title}' deleted successfully.")
-        return task
\ No newline at end of file
+        return task
+
+
+    # Import tasks in bulk, collecting rejected rows instead of printing errors
+    def import_tasks(self, rows, rejected, projects_controller):
+        # Load both files once so the ID checks below are dictionary lookups
+        self.data, projects_controller.data
+        imported = []
+        for line_number, row in rows:
+            project_id, title = self._value(row, "project_id"), self._value(row, "title")
+            status = self._value(row, "status") or "active"
+            task_id = self._value(row, "id") or None
+            error = (
+                self._check_title(title)
+                or self._check_status(status)
+                or self._check_new_id(task_id)
+                or (None if projects_controller.find_by_id(project_id) else f"Project with ID {project_id} not found.")
+            )
+            if error:
+                rejected.append((line_number, row, error))
+                continue
+            
+            task = Task(project_id=project_id, title=title, status=status, task_id=task_id)
+            self._insert(task)
+            imported.append(self._index[task._id])
+        return imported
+
+    # Show the number of tasks per status
+    def task_stats(self, args=None):
+        args = args or {}
+        counts = self.status_counts()
+        output_format = args.get("format", "table")
+        
+        # Machine-readable output
+        if output_format != "table":
+            output.write_records(({"status": status, "count": count} for status, count in counts.items()), output_format)
+            return counts
+        
+        # Create table
+        table = new_table("Tasks by Status")
+        table.add_column("Status", style="white")
+        table.add_column("Count", justify="right")
+        for status, count in counts.items():
+            table.add_row(status, str(count))
+        table.add_row("total", str(sum(counts.values())), style="bold")
+        
+        console.print(table)
+        return counts
\ No newline at end of file
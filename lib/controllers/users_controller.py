@@ -2,63 +2,97 @@
 
 # Requires
 from lib.models.user import User
-from lib.utils import storage
-from rich.console import Console
-from rich.table import Table
-from rich import box
+from lib.controllers.base_controller import BaseController
+from lib.utils import output
+from lib.utils.console import console, new_table
 import re
 
-# Console instance
-console = Console()
 
+class UsersController(BaseController):
+    model = User
+    table = "users"
 
-class UsersController:
-    def __init__(self, file_path):
-        self.file_path = file_path
-        self.data = []
+    def __init__(self, file_path, backend=None):
+        super().__init__(file_path, backend)
+        self._emails = {}
 
 
-    # Load data
-    def __enter__(self):
-        self.data = [User.from_dict(user) for user in storage.load_data(self.file_path)]
-        return self
- 
+    # Rebuild the email index along with the other indexes
+    def _load(self):
+        self._emails = {}
+        super()._load()
 
-    # Save data
-    def __exit__(self, exc_type, exc_value, ex_tb):
-        storage.save_data(self.file_path, [user.to_dict() for user in self.data])
-    
 
-    # Validate name
+    # Normalize email for case-insensitive matching
     @staticmethod
-    def _validate_name(name):
+    def _email_key(email):
+        return email.strip().lower()
+
+
+    # Add user to the email index
+    def _link(self, record):
+        super()._link(record)
+        self._emails[self._email_key(record.email)] = record
+
+
+    # Remove user from the email index
+    def _unlink(self, record):
+        super()._unlink(record)
+        if self._emails.get(self._email_key(record.email)) is record:
+            del self._emails[self._email_key(record.email)]
+
+
+    # Find a user by email
+    def find_by_email(self, email):
+        key = self._email_key(email)
+        if not self.loaded:
+            # Backends that support it query just this email
+            if self.backend.queries:
+                rows = self.backend.query(self, "email", email)
+                matches = self._match(rows, lambda record: self._email_key(record.email) == key)
+                return matches[0] if matches else None
+            self._load()
+        return self._emails.get(key)
+
+
+    # Check name, returning an error message if it is invalid
+    @staticmethod
+    def _check_name(name):
         # Check not empty
         if not name.strip():
-            console.print("[red]✗ Error:[/red] Name cannot be empty.")
-            return False
+            return "Name cannot be empty."
         
         # Check format: letters, spaces, periods, hyphens, apostrophes only
         if not re.fullmatch(r"[A-Za-z][A-Za-z\s'\.\-]*", name):
-            console.print("[red]✗ Error:[/red] Name can only contain letters, spaces, periods, hyphens, and apostrophes.")
-            return False
+            return "Name can only contain letters, spaces, periods, hyphens, and apostrophes."
         
-        return True
+        return None
 
 
-    # Validate email
+    # Check email, returning an error message if it is invalid
     @staticmethod
-    def _validate_email(email):
+    def _check_email(email):
         # Check not empty
         if not email.strip():
-            console.print("[red]✗ Error:[/red] Email cannot be empty.")
-            return False
+            return "Email cannot be empty."
         
         # Check format
         if not re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", email):
-            console.print("[red]✗ Error:[/red] Invalid email format.")
-            return False
+            return "Invalid email format."
         
-        return True
+        return None
+
+
+    # Validate name
+    @staticmethod
+    def _validate_name(name):
+        return UsersController._report(UsersController._check_name(name))
+
+
+    # Validate email
+    @staticmethod
+    def _validate_email(email):
+        return UsersController._report(UsersController._check_email(email))
 
 
     # Add user
@@ -72,30 +106,47 @@ class UsersController:
             return None
         
         # Check for duplicate email
-        if any(u.email == args["email"] for u in self.data):
+        if self.find_by_email(args["email"]):
             console.print(f"[red]✗ Error:[/red] User with email {args['email']} already exists.")
             return None
         
         # Create user
         user = User(name=args["name"], email=args["email"])
-        self.data.append(user)
-        console.print(f"[green]✓ Success:[/green] User {user.name} added successfully with ID: {user._id}.")
+        self._insert(user)
+        console.print(f"[green]✓ Success:[/green] User {user.name} added successfully with ID: {user.id}.")
         return user
 
 
-    # Get user by ID with all projects and tasks 
+    # Get user by ID or email with all projects and tasks 
     def get_user(self, args, projects_controller=None, tasks_controller=None):
-        user = next((u for u in self.data if u._id == args["id"]), None)
+        if args.get("email"):
+            user = self.find_by_email(args["email"])
+            lookup = f"email {args['email']}"
+        else:
+            user = self.find_by_id(args["id"])
+            lookup = f"ID {args['id']}"
         
         # User not found
         if not user:
-            console.print(f"[red]✗ Error:[/red] User with ID {args['id']} not found.")
+            console.print(f"[red]✗ Error:[/red] User with {lookup} not found.")
             return None
         
+        # Machine-readable output nests projects and their tasks
+        output_format = args.get("format", "table")
+        if output_format != "table":
+            record = user.to_dict()
+            if projects_controller and tasks_controller:
+                record["projects"] = [
+                    {**project.to_dict(), "tasks": [task.to_dict() for task in tasks_controller.find_by("project_id", project._id)]}
+                    for project in projects_controller.find_by("assigned_to_id", user._id)
+                ]
+            output.write_records([record], output_format)
+            return user
+        
         # User header
         console.print(f"\n[bold cyan]User: {user.name}[/bold cyan]")
         console.print(f"Email: {user.email}")
-        console.print(f"ID: {user._id}\n")
+        console.print(f"ID: {user.id}\n")
         console.rule()
         
         # If no controllers provided, just show user info
@@ -103,7 +154,7 @@ class UsersController:
             return user
         
         # Find user's projects
-        user_projects = [p for p in projects_controller.data if p.assigned_to_id == user._id]
+        user_projects = projects_controller.find_by("assigned_to_id", user._id)
         
         if not user_projects:
             console.print("[yellow]⚠ Warning:[/yellow] No projects found for this user.")
@@ -117,16 +168,16 @@ class UsersController:
             console.print(f"\n[bold green]Project: {project.title}[/bold green]")
             console.print(f"Description: {project.description}")
             console.print(f"Status: [{status_color}]{project.status}[/{status_color}] | Due: {project.due_date}")
-            console.print(f"ID: {project._id}\n")
+            console.print(f"ID: {project.id}\n")
             
             # Find tasks for this project
-            project_tasks = [t for t in tasks_controller.data if t.project_id == project._id]
+            project_tasks = tasks_controller.find_by("project_id", project._id)
             
             if not project_tasks:
                 console.print("  [yellow]No tasks for this project[/yellow]")
             else:
                 # Create task table
-                task_table = Table(box=box.SIMPLE, show_header=True)
+                task_table = new_table()
                 task_table.add_column("ID", style="cyan", justify="center")
                 task_table.add_column("Title", style="white")
                 task_table.add_column("Status", justify="center")
@@ -138,7 +189,7 @@ class UsersController:
                     else:
                         status_display = "[blue]completed[/blue]"
                     
-                    task_table.add_row(task._id, task.title, status_display)
+                    task_table.add_row(task.id, task.title, status_display)
                 
                 console.print(task_table)
             
@@ -148,28 +199,51 @@ class UsersController:
 
 
     # List users
-    def list_users(self):
+    def list_users(self, args=None):
+        args = args or {}
+        users, next_cursor = self.page(args.get("limit"), args.get("after"))
+        output_format = args.get("format", "table")
+        
         # Check if there are any users
-        if not self.data:
+        if not users and output_format == "table":
             console.print("[yellow]⚠ Warning:[/yellow] No users found.")
-            return
+            return []
+        
+        # Stream machine-readable output without building a table
+        if output_format != "table":
+            output.write_records((user.to_dict() for user in users), output_format)
+            if next_cursor:
+                output.write_next_page(next_cursor)
+            return users
+        
+        # Stream large tables row by row instead of building them with rich
+        if len(users) > output.STREAM_THRESHOLD:
+            output.stream_table("All Users", ["ID", "Name", "Email"], ((user.id, user.name, user.email) for user in users))
+            if next_cursor:
+                print(f"Next page: --after {next_cursor}")
+            return users
         
         # Create table
-        table = Table(title="All Users", box=box.SIMPLE)
+        table = new_table("All Users")
         table.add_column("ID", style="cyan", justify="center")
         table.add_column("Name", style="white")
         table.add_column("Email", style="white")
         
         # Add rows
-        for user in self.data:
-            table.add_row(user._id, user.name, user.email)
+        for user in users:
+            table.add_row(user.id, user.name, user.email)
         
         console.print(table)
+        
+        # Show cursor for the next page
+        if next_cursor:
+            console.print(f"Next page: --after {next_cursor}")
+        return users
 
 
     # Update user
     def update_user(self, args):
-        user = next((u for u in self.data if u._id == args["id"]), None)
+        user = self.find_by_id(args["id"])
         
         if not user:
             console.print(f"[red]✗ Error:[/red] User with ID {args['id']} not found.")
@@ -186,24 +260,29 @@ class UsersController:
                 return None
             
             # Check for duplicate email if updating email
-            if args["email"] != user.email:
-                if any(u.email == args["email"] for u in self.data):
-                    console.print(f"[red]✗ Error:[/red] Email {args['email']} is already in use.")
-                    return None
+            existing = self.find_by_email(args["email"])
+            if existing and existing is not user:
+                console.print(f"[red]✗ Error:[/red] Email {args['email']} is already in use.")
+                return None
         
         # Update fields if provided
         if "name" in args:
             user.name = args["name"]
         if "email" in args:
+            self._unlink(user)
             user.email = args["email"]
+            self._link(user)
         
+        # Mark user as changed
+        self._touch(user)
+
         console.print(f"[green]✓ Success:[/green] User {user.name} updated successfully.")
         return user
     
 
     # Delete user
     def delete_user(self, args):
-        user = next((u for u in self.data if u._id == args["id"]), None)
+        user = self.find_by_id(args["id"])
         
         # Check if user exists
         if not user:
@@ -211,12 +290,36 @@ class UsersController:
             return None
         
         # Ask for confirmation
-        confirm = input(f"Are you sure you want to delete user {user.name} (ID: {user._id})? (y/n): ")
+        confirm = input(f"Are you sure you want to delete user {user.name} (ID: {user.id})? (y/n): ")
         if confirm.lower() != "y":
             console.print("[yellow]⚠ Warning:[/yellow] Delete cancelled.")
             return None
         
         # If confirmed, delete the user
-        self.data.remove(user)
+        self._remove(user)
         console.print(f"[green]✓ Success:[/green] User {user.name} deleted successfully.")
-        return user
\ No newline at end of file
+        return user
+
+
+    # Import users in bulk, collecting rejected rows instead of printing errors
+    def import_users(self, rows, rejected):
+        # Load once so the ID and email checks below are dictionary lookups
+        self.data
+        imported = []
+        for line_number, row in rows:
+            name, email = self._value(row, "name"), self._value(row, "email")
+            user_id = self._value(row, "id") or None
+            error = (
+                self._check_name(name)
+                or self._check_email(email)
+                or self._check_new_id(user_id)
+                or (f"User with email {email} already exists." if self._email_key(email) in self._emails else None)
+            )
+            if error:
+                rejected.append((line_number, row, error))
+                continue
+            
+            user = User(name=name, email=email, user_id=user_id)
+            self._insert(user)
+            imported.append(user)
+        return imported
\ No newline at end of file
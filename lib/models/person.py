@@ -1,14 +1,17 @@
 # lib/models/person.py
 
 # Requires
-import uuid
+from lib.models import ids
 
 
 class Person:
-    def __init__(self, name, email):
+    # Attributes live in fixed slots instead of a per-instance __dict__
+    __slots__ = ("_name", "_email", "_id")
+
+    def __init__(self, name, email, person_id=None):
         self._name = name
         self._email = email
-        self._id = str(uuid.uuid4())
+        self._id = ids.parse(person_id) if person_id else ids.new_id()
 
 
     # Name property
@@ -33,7 +36,7 @@ class Person:
         self._email = value
 
 
-    # ID property (read-only)
+    # ID property as text (read-only)
     @property
     def id(self):
-        return self._id
\ No newline at end of file
+        return ids.text(self._id)
\ No newline at end of file
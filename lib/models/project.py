@@ -4,27 +4,34 @@
 # Belongs to one user
 
 # Requires
-import uuid
+from lib.models import ids
+from lib.models.status import Status
 
 
 class Project:
+    # No per-instance __dict__, which would outweigh the project's own fields
+    __slots__ = ("assigned_to_id", "title", "description", "due_date", "status", "_id")
+
     def __init__(self, assigned_to_id, title, description, due_date, status="active", project_id=None):
-        self.assigned_to_id = assigned_to_id
+        self.assigned_to_id = ids.parse(assigned_to_id)
         self.title = title
         self.description = description
         self.due_date = due_date
-        self.status = status
-        if not project_id:
-            self._id = str(uuid.uuid4())
-        else:
-            self._id = project_id
+        self.status = Status.parse(status)
+        self._id = ids.parse(project_id) if project_id else ids.new_id()
+
+
+    # ID property as text (read-only)
+    @property
+    def id(self):
+        return ids.text(self._id)
             
         
     # Serialization
     def to_dict(self):
         return {
-            "id": self._id,
-            "assigned_to_id": self.assigned_to_id,
+            "id": self.id,
+            "assigned_to_id": ids.text(self.assigned_to_id),
             "title": self.title,
             "description": self.description,
             "due_date": self.due_date,
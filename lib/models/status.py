@@ -0,0 +1,26 @@
+# lib/models/status.py
+
+# Project and task statuses
+# Records share one Status member per value instead of each holding its own
+# copy of the string. Status is a str subclass, so members still compare
+# equal to, hash like and print as their text.
+
+# Requires
+from enum import Enum
+
+
+class Status(str, Enum):
+    ACTIVE = "active"
+    COMPLETED = "completed"
+
+    # Print as the plain value rather than Status.ACTIVE
+    def __str__(self):
+        return self.value
+
+    __format__ = str.__format__
+
+
+    # Get the member for a status value, keeping values that are not statuses as they are
+    @classmethod
+    def parse(cls, value):
+        return cls._value2member_map_.get(value, value)
@@ -3,25 +3,32 @@
 # Belongs to one project
 
 # Requires
-import uuid
+from lib.models import ids
+from lib.models.status import Status
 
 
 class Task:
+    # Tasks are the most numerous records, so they are kept as small as possible
+    __slots__ = ("project_id", "title", "status", "_id")
+
     def __init__(self, project_id, title, status="active", task_id=None):
-        self.project_id = project_id
+        self.project_id = ids.parse(project_id)
         self.title = title
-        self.status = status
-        if not task_id:
-            self._id = str(uuid.uuid4())
-        else:
-            self._id = task_id
+        self.status = Status.parse(status)
+        self._id = ids.parse(task_id) if task_id else ids.new_id()
+
+
+    # ID property as text (read-only)
+    @property
+    def id(self):
+        return ids.text(self._id)
             
         
     # Serialization
     def to_dict(self):
         return {
-            "id": self._id,
-            "project_id": self.project_id,
+            "id": self.id,
+            "project_id": ids.text(self.project_id),
             "title": self.title,
             "status": self.status
         }
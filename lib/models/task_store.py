@@ -0,0 +1,287 @@
+# lib/models/task_store.py
+
+# Column-oriented storage for tasks
+# Each field is kept in its own list or array instead of one object per task.
+# Status values are stored as one-byte codes, so counting and filtering by
+# status run over a compact array, and project IDs are shared between tasks.
+# Rows are read and changed through TaskRow views, which behave like Task.
+# IDs are kept in their in-memory form (see lib.models.ids).
+
+# Requires
+from array import array
+from heapq import nsmallest
+from itertools import compress, repeat
+from operator import eq
+from lib.models import ids
+from lib.models.status import Status
+
+# Code marking a deleted row (rows are never moved, so views stay valid)
+DELETED = 255
+
+
+class TaskRow:
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+
+    # ID (read-only)
+    @property
+    def _id(self):
+        return self._store.ids[self._row]
+
+    @property
+    def id(self):
+        return ids.text(self._id)
+
+
+    # Project ID property
+    @property
+    def project_id(self):
+        return self._store.project_ids[self._row]
+
+    @project_id.setter
+    def project_id(self, value):
+        self._store.move(self._row, ids.parse(value))
+
+
+    # Title property
+    @property
+    def title(self):
+        return self._store.titles[self._row]
+
+    @title.setter
+    def title(self, value):
+        self._store.titles[self._row] = value
+
+
+    # Status property
+    @property
+    def status(self):
+        return self._store.statuses[self._store.codes[self._row]]
+
+    @status.setter
+    def status(self, value):
+        self._store.codes[self._row] = self._store.status_code(value)
+
+
+    # Serialization
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "project_id": ids.text(self.project_id),
+            "title": self.title,
+            "status": self.status
+        }
+
+
+    # String representation
+    def __str__(self):
+        return str(self.to_dict())
+
+
+    # A view equals any task (view or Task) with the same ID
+    def __eq__(self, other):
+        return getattr(other, "_id", None) == self._id
+
+    def __hash__(self):
+        return hash(self._id)
+
+
+# Dictionary-like view of a store's tasks keyed by ID
+class TaskIndex:
+    def __init__(self, store):
+        self._store = store
+
+
+    def get(self, task_id, default=None):
+        row = self._store.rows.get(task_id)
+        return default if row is None else TaskRow(self._store, row)
+
+
+    def __getitem__(self, task_id):
+        return TaskRow(self._store, self._store.rows[task_id])
+
+
+    def __contains__(self, task_id):
+        return task_id in self._store.rows
+
+
+    def __len__(self):
+        return len(self._store.rows)
+
+
+    def __iter__(self):
+        return iter(self._store.rows)
+
+
+    # Adding a task that is already stored (e.g. by TaskStore.append) changes nothing
+    def __setitem__(self, task_id, task):
+        if task_id not in self._store.rows:
+            self._store.append(task)
+
+
+    def __delitem__(self, task_id):
+        if task_id in self._store.rows:
+            self._store.delete(self._store.rows[task_id])
+
+
+    def values(self):
+        return iter(self._store)
+
+
+class TaskStore:
+    def __init__(self):
+        # Columns, one entry per row
+        self.ids = []
+        self.project_ids = []
+        self.titles = []
+        self.codes = array("B")
+
+        # Status values by code, and codes by value
+        self.statuses = list(Status)
+        self._status_codes = {status: code for code, status in enumerate(self.statuses)}
+
+        # Row numbers by task ID and by project ID
+        self.rows = {}
+        self.by_project = {}
+
+        # One shared string per project ID
+        self._project_ids = {}
+        self.index = TaskIndex(self)
+
+
+    # Build a store from task dictionaries
+    @classmethod
+    def from_dicts(cls, rows):
+        store = cls()
+        for row in rows:
+            store.add(ids.parse(row["id"]), ids.parse(row.get("project_id")), row.get("title"), row.get("status", "active"))
+        return store
+
+
+    # Get the code for a status, adding new values as they appear
+    def status_code(self, status):
+        code = self._status_codes.get(status)
+        if code is None:
+            code = len(self.statuses)
+            if code >= DELETED:
+                raise ValueError("Too many distinct task statuses")
+            self.statuses.append(status)
+            self._status_codes[status] = code
+        return code
+
+
+    # Add a row and return its number
+    def add(self, task_id, project_id, title, status):
+        row = len(self.ids)
+        project_id = self._project_ids.setdefault(project_id, project_id)
+        self.ids.append(task_id)
+        self.project_ids.append(project_id)
+        self.titles.append(title)
+        self.codes.append(self.status_code(status))
+        self.rows[task_id] = row
+        self.by_project.setdefault(project_id, []).append(row)
+        return row
+
+
+    # Copy a task (or a view) into the store, replacing the row with its ID
+    def append(self, task):
+        row = self.rows.get(task._id)
+        if row is None:
+            return self.add(task._id, task.project_id, task.title, task.status)
+        self.move(row, task.project_id)
+        self.titles[row] = task.title
+        self.codes[row] = self.status_code(task.status)
+        return row
+
+
+    # Remove a task (or a view) from the store
+    def remove(self, task):
+        self.delete(self.rows[task._id])
+
+
+    # Mark a row deleted
+    def delete(self, row):
+        del self.rows[self.ids[row]]
+        self.by_project[self.project_ids[row]].remove(row)
+        self.codes[row] = DELETED
+
+
+    # Change a row's project, keeping the project index in step
+    def move(self, row, project_id):
+        project_id = self._project_ids.setdefault(project_id, project_id)
+        if self.project_ids[row] == project_id:
+            return
+        self.by_project[self.project_ids[row]].remove(row)
+        self.by_project.setdefault(project_id, []).append(row)
+        self.project_ids[row] = project_id
+
+
+    # Iterate over views of the stored tasks in the order they were added
+    def __iter__(self):
+        for row, code in enumerate(self.codes):
+            if code != DELETED:
+                yield TaskRow(self, row)
+
+
+    def __len__(self):
+        return len(self.rows)
+
+
+    # Count tasks per status
+    def status_counts(self):
+        counts = {status: self.codes.count(code) for code, status in enumerate(self.statuses)}
+        return {status: count for status, count in counts.items() if count}
+
+
+    # Get views of the tasks matching a status and/or project, in stored order
+    def filter(self, status=None, project_id=None):
+        if status is None and project_id is None:
+            return list(self)
+        return [TaskRow(self, row) for row in self.filter_rows(status, project_id)]
+
+
+    # Get the row numbers of the tasks matching a status and/or project, in stored order
+    def filter_rows(self, status=None, project_id=None):
+        if project_id is not None:
+            rows = self.by_project.get(project_id, [])
+            if status is not None:
+                code = self._status_codes.get(status)
+                rows = [row for row in rows if self.codes[row] == code]
+            return sorted(rows)
+        if status is not None:
+            code = self._status_codes.get(status)
+            if code is None:
+                return []
+            # Compare the whole status column without a Python-level loop body
+            return list(compress(range(len(self.codes)), map(eq, self.codes, repeat(code))))
+        return [row for row, code in enumerate(self.codes) if code != DELETED]
+
+
+    # Get views for one page of rows and the cursor for the next page
+    # Pages are ordered by task ID compared as text, like BaseController.page;
+    # without paging options the rows keep their order
+    def page(self, rows, limit=None, after=None):
+        if limit is not None or after is not None:
+            try:
+                # UUID integers compare in the same order as their text
+                rows = self._first_rows(rows, self.ids.__getitem__, limit, None if after is None else ids.parse(after))
+            except TypeError:
+                # String and integer IDs are mixed, so compare them as text
+                rows = self._first_rows(rows, lambda row: ids.text(self.ids[row]), limit, after)
+        page_rows = rows[:limit] if limit else rows
+        next_cursor = ids.text(self.ids[page_rows[-1]]) if limit and len(rows) > limit else None
+        return [TaskRow(self, row) for row in page_rows], next_cursor
+
+
+    # Get the rows after a cursor in key order, only sorting as many as a page needs
+    @staticmethod
+    def _first_rows(rows, key, limit, after):
+        if after is not None:
+            rows = [row for row in rows if key(row) > after]
+        if limit:
+            return nsmallest(limit + 1, rows, key=key)
+        return sorted(rows, key=key)
@@ -7,16 +7,16 @@ from lib.models.person import Person
 
 
 class User(Person):
+    __slots__ = ()
+
     def __init__(self, name, email, user_id=None):
-        super().__init__(name, email)
-        if user_id:
-            self._id = user_id
+        super().__init__(name, email, user_id)
             
         
     # Serialization
     def to_dict(self):
         return {
-            "id": self._id,
+            "id": self.id,
             "name": self.name,
             "email": self.email 
         }
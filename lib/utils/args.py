@@ -2,98 +2,208 @@
 
 # Requires
 import argparse
+from lib.utils.output import FORMATS
+from lib.utils.imports import FORMATS as IMPORT_FORMATS
 
 
-def create_parser():
+# Command names mapped to their help text and a function adding their arguments
+COMMANDS = {}
+
+
+# Register a function that adds a command's arguments to its parser
+def command(name, help):
+    def register(setup):
+        COMMANDS[name] = (help, setup)
+        return setup
+    return register
+
+
+# Parse a whole number greater than zero
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
+
+
+# Add keyset pagination options to a list parser
+def add_paging_arguments(parser):
+    parser.add_argument("--limit", type=positive_int, help="Maximum number of rows to show (pages are ordered by ID)")
+    parser.add_argument("--after", help="Only show rows with IDs after this cursor")
+
+
+# Add bulk import options to an import parser
+def add_import_arguments(parser):
+    parser.add_argument("--file", required=True, help="CSV or JSON Lines file to import")
+    parser.add_argument("--input-format", choices=IMPORT_FORMATS, help="Format of the file (detected from its extension by default)")
+    parser.add_argument("--errors", help="File for rejected rows (defaults to the input file name with .errors.jsonl)")
+
+
+# Find the command named on the command line, if any
+def find_command(argv):
+    for arg in argv:
+        if arg in COMMANDS:
+            return arg
+    return None
+
+
+def create_parser(argv=None):
     # Create the main parser
     parser = argparse.ArgumentParser(description="Project Management CLI Tool")
-    
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show which data files were saved")
+    parser.add_argument("--pager", action="store_true", help="Show output through a pager ($PAGER or less)")
+    parser.add_argument("--format", dest="output_format", choices=FORMATS, default="table", help="Output format for list and get commands")
+
     # Create subparsers for commands
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
-    
-    # Setup user parsers
-    setup_user_parsers(subparsers)
-    
-    # Setup project parsers
-    setup_project_parsers(subparsers)
-    
-    # Setup task parsers
-    setup_task_parsers(subparsers)
-    
+
+    # Only the invoked command's parser is built; help and errors list every command
+    name = find_command(argv) if argv is not None else None
+    names = [name] if name else COMMANDS
+    for name in names:
+        help, setup = COMMANDS[name]
+        setup(subparsers.add_parser(name, help=help))
+
     return parser
 
 
-def setup_user_parsers(subparsers):
-    # Add user
-    parser_add_user = subparsers.add_parser("add-user", help="Add a new user")
-    parser_add_user.add_argument("--name", required=True, help="User name")
-    parser_add_user.add_argument("--email", required=True, help="User email")
-    
-    # List users
-    parser_list_users = subparsers.add_parser("list-users", help="List all users")
-    
-    # Get user
-    parser_get_user = subparsers.add_parser("get-user", help="Get user by ID")
-    parser_get_user.add_argument("--id", required=True, help="User ID")
-    
-    # Update user
-    parser_update_user = subparsers.add_parser("update-user", help="Update an existing user")
-    parser_update_user.add_argument("--id", required=True, help="User ID")
-    parser_update_user.add_argument("--name", help="New user name")
-    parser_update_user.add_argument("--email", help="New user email")
-    
-    # Delete user
-    parser_delete_user = subparsers.add_parser("delete-user", help="Delete a user")
-    parser_delete_user.add_argument("--id", required=True, help="User ID")
-
-
-def setup_project_parsers(subparsers):
-    # Add project
-    parser_add_project = subparsers.add_parser("add-project", help="Add a new project")
-    parser_add_project.add_argument("--assigned-to-id", required=True, help="User ID to assign project to")
-    parser_add_project.add_argument("--title", required=True, help="Project title")
-    parser_add_project.add_argument("--description", required=True, help="Project description")
-    parser_add_project.add_argument("--due-date", required=True, help="Due date (MM-DD-YYYY)")
-    
-    # List projects
-    parser_list_projects = subparsers.add_parser("list-projects", help="List all projects")
-    
-    # Get project
-    parser_get_project = subparsers.add_parser("get-project", help="Get project by ID")
-    parser_get_project.add_argument("--id", required=True, help="Project ID")
-    
-    # Update project
-    parser_update_project = subparsers.add_parser("update-project", help="Update an existing project")
-    parser_update_project.add_argument("--id", required=True, help="Project ID")
-    parser_update_project.add_argument("--title", help="New project title")
-    parser_update_project.add_argument("--description", help="New project description")
-    parser_update_project.add_argument("--due-date", help="New due date (MM-DD-YYYY)")
-    parser_update_project.add_argument("--status", help="New status (active/completed)")
-    
-    # Delete project
-    parser_delete_project = subparsers.add_parser("delete-project", help="Delete a project")
-    parser_delete_project.add_argument("--id", required=True, help="Project ID")
-
-
-def setup_task_parsers(subparsers):
-    # Add task
-    parser_add_task = subparsers.add_parser("add-task", help="Add a new task")
-    parser_add_task.add_argument("--project-id", required=True, help="Project ID")
-    parser_add_task.add_argument("--title", required=True, help="Task title")
-    
-    # List tasks
-    parser_list_tasks = subparsers.add_parser("list-tasks", help="List all tasks")
-    
-    # Get task
-    parser_get_task = subparsers.add_parser("get-task", help="Get task by ID")
-    parser_get_task.add_argument("--id", required=True, help="Task ID")
-    
-    # Update task
-    parser_update_task = subparsers.add_parser("update-task", help="Update an existing task")
-    parser_update_task.add_argument("--id", required=True, help="Task ID")
-    parser_update_task.add_argument("--title", help="New task title")
-    parser_update_task.add_argument("--status", help="New status (active/completed)")
-    
-    # Delete task
-    parser_delete_task = subparsers.add_parser("delete-task", help="Delete a task")
-    parser_delete_task.add_argument("--id", required=True, help="Task ID")
\ No newline at end of file
+@command("add-user", "Add a new user")
+def add_user_arguments(parser):
+    parser.add_argument("--name", required=True, help="User name")
+    parser.add_argument("--email", required=True, help="User email")
+
+
+@command("list-users", "List all users")
+def list_users_arguments(parser):
+    add_paging_arguments(parser)
+
+
+@command("get-user", "Get user by ID or email")
+def get_user_arguments(parser):
+    lookup = parser.add_mutually_exclusive_group(required=True)
+    lookup.add_argument("--id", help="User ID")
+    lookup.add_argument("--email", help="User email")
+
+
+@command("update-user", "Update an existing user")
+def update_user_arguments(parser):
+    parser.add_argument("--id", required=True, help="User ID")
+    parser.add_argument("--name", help="New user name")
+    parser.add_argument("--email", help="New user email")
+
+
+@command("delete-user", "Delete a user")
+def delete_user_arguments(parser):
+    parser.add_argument("--id", required=True, help="User ID")
+
+
+@command("add-project", "Add a new project")
+def add_project_arguments(parser):
+    parser.add_argument("--assigned-to-id", required=True, help="User ID to assign project to")
+    parser.add_argument("--title", required=True, help="Project title")
+    parser.add_argument("--description", required=True, help="Project description")
+    parser.add_argument("--due-date", required=True, help="Due date (MM-DD-YYYY)")
+
+
+@command("list-projects", "List all projects")
+def list_projects_arguments(parser):
+    add_paging_arguments(parser)
+
+
+@command("get-project", "Get project by ID")
+def get_project_arguments(parser):
+    parser.add_argument("--id", required=True, help="Project ID")
+
+
+@command("update-project", "Update an existing project")
+def update_project_arguments(parser):
+    parser.add_argument("--id", required=True, help="Project ID")
+    parser.add_argument("--title", help="New project title")
+    parser.add_argument("--description", help="New project description")
+    parser.add_argument("--due-date", help="New due date (MM-DD-YYYY)")
+    parser.add_argument("--status", help="New status (active/completed)")
+
+
+@command("delete-project", "Delete a project")
+def delete_project_arguments(parser):
+    parser.add_argument("--id", required=True, help="Project ID")
+
+
+@command("add-task", "Add a new task")
+def add_task_arguments(parser):
+    parser.add_argument("--project-id", required=True, help="Project ID")
+    parser.add_argument("--title", required=True, help="Task title")
+
+
+@command("list-tasks", "List all tasks")
+def list_tasks_arguments(parser):
+    add_paging_arguments(parser)
+    parser.add_argument("--status", help="Only show tasks with this status")
+    parser.add_argument("--project-id", help="Only show tasks in this project")
+
+
+@command("task-stats", "Count tasks by status")
+def task_stats_arguments(parser):
+    pass
+
+
+@command("get-task", "Get task by ID")
+def get_task_arguments(parser):
+    parser.add_argument("--id", required=True, help="Task ID")
+
+
+@command("update-task", "Update an existing task")
+def update_task_arguments(parser):
+    parser.add_argument("--id", required=True, help="Task ID")
+    parser.add_argument("--title", help="New task title")
+    parser.add_argument("--status", help="New status (active/completed)")
+
+
+@command("delete-task", "Delete a task")
+def delete_task_arguments(parser):
+    parser.add_argument("--id", required=True, help="Task ID")
+
+
+@command("import-users", "Import users from a CSV or JSON Lines file")
+def import_users_arguments(parser):
+    add_import_arguments(parser)
+
+
+@command("import-projects", "Import projects from a CSV or JSON Lines file")
+def import_projects_arguments(parser):
+    add_import_arguments(parser)
+
+
+@command("import-tasks", "Import tasks from a CSV or JSON Lines file")
+def import_tasks_arguments(parser):
+    add_import_arguments(parser)
+
+
+@command("export", "Export users with their projects and tasks, one row per task (jsonl unless --format is given)")
+def export_arguments(parser):
+    parser.add_argument("--file", default="-", help="File to write (defaults to stdout)")
+
+
+# Import JSON files into SQLite
+@command("migrate", "Import the JSON data files into the SQLite database")
+def migrate_arguments(parser):
+    parser.add_argument("--database", help="SQLite database file (defaults to database_file in settings)")
+
+
+# Fold journal logs into snapshots
+@command("compact", "Fold journal logs into the data file snapshots")
+def compact_arguments(parser):
+    pass
+
+
+# Run many commands in one process
+@command("batch", "Run commands from a file or stdin, one per line, saving once at the end")
+def batch_arguments(parser):
+    parser.add_argument("--file", default="-", help="File of command lines or JSON operations (defaults to stdin)")
+    parser.add_argument("--yes", action="store_true", help="Confirm deletes instead of cancelling them")
+
+
+# Serve commands from memory
+@command("daemon", "Keep data loaded and serve commands over a local socket until stopped")
+def daemon_arguments(parser):
+    pass
@@ -0,0 +1,145 @@
+# lib/utils/binary_format.py
+
+# Compact binary encoding for lists of flat records
+# Layout: magic, header (record count, key list, text block size), one type
+# code per value, and a single UTF-8 text block holding every string value.
+# Strings are separated by NUL characters so loading is one decode and one
+# split; if any value contains NUL, per-string lengths are stored instead.
+# The sizes are checked on load so a truncated file fails instead of loading
+# partial records.
+
+# Requires
+import json
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+# File signature used to detect the format
+MAGIC = b"PMBIN1\n"
+
+# Value type codes
+STRING = 0
+NULL = 1
+MISSING = 2
+OTHER = 3
+
+
+# Encode a list of dictionaries to bytes
+def encode(records):
+    # Collect keys in first-seen order
+    keys = {}
+    for record in records:
+        for key in record:
+            keys.setdefault(key, None)
+    keys = list(keys)
+
+    types = bytearray()
+    strings = []
+    for record in records:
+        for key in keys:
+            if key not in record:
+                types.append(MISSING)
+                continue
+            value = record[key]
+            if value is None:
+                types.append(NULL)
+                continue
+            if isinstance(value, str):
+                types.append(STRING)
+            else:
+                # Numbers, lists and nested values are stored as JSON text
+                types.append(OTHER)
+                value = json.dumps(value)
+            strings.append(value)
+
+    # Separate strings with NUL unless a value contains one
+    if any("\0" in value for value in strings):
+        separator = ""
+        lengths = array("I", map(len, strings))
+    else:
+        separator = "\0"
+        lengths = array("I")
+    if sys.byteorder == "big":
+        lengths.byteswap()
+
+    header = json.dumps(keys).encode("utf-8")
+    text = separator.join(strings).encode("utf-8")
+    return b"".join([
+        MAGIC,
+        struct.pack("<IIII", len(records), len(header), len(lengths), len(text)),
+        header,
+        bytes(types),
+        lengths.tobytes(),
+        text
+    ])
+
+
+# Error for a file whose sizes do not match its contents
+def _corrupt(detail):
+    return ValueError(f"Binary data is truncated or corrupt: {detail}")
+
+
+# Decode bytes produced by encode back into a list of dictionaries
+def decode(payload):
+    position = len(MAGIC)
+    try:
+        count, header_size, length_count, text_size = struct.unpack_from("<IIII", payload, position)
+    except struct.error:
+        raise _corrupt("incomplete header") from None
+    position += 16
+    keys = json.loads(payload[position:position + header_size])
+    position += header_size
+    types = payload[position:position + count * len(keys)]
+    position += len(types)
+    if len(types) != count * len(keys):
+        raise _corrupt(f"{len(types)} of {count * len(keys)} type codes")
+    lengths = array("I")
+    lengths_size = length_count * lengths.itemsize
+    if len(payload) < position + lengths_size:
+        raise _corrupt("incomplete string lengths")
+    lengths.frombytes(payload[position:position + lengths_size])
+    position += lengths_size
+    if sys.byteorder == "big":
+        lengths.byteswap()
+
+    # Split or slice every string out of one decoded text block
+    text = payload[position:]
+    if len(text) != text_size:
+        raise _corrupt(f"text block has {len(text)} of {text_size} bytes")
+    text = text.decode("utf-8")
+    string_count = len(types) - types.count(NULL) - types.count(MISSING)
+    if not string_count:
+        values = []
+    elif not length_count:
+        values = text.split("\0")
+    else:
+        ends = list(accumulate(lengths))
+        starts = [0] + ends[:-1]
+        values = [text[start:end] for start, end in zip(starts, ends)]
+        if ends[-1] != len(text):
+            raise _corrupt(f"strings need {ends[-1]} characters, text block has {len(text)}")
+    if len(values) != string_count:
+        raise _corrupt(f"{len(values)} of {string_count} string values")
+    strings = iter(values)
+
+    width = len(keys)
+    if not width:
+        return [{} for _ in range(count)]
+
+    # Fast path when every value is a string
+    if not types.strip(bytes([STRING])):
+        return [dict(zip(keys, row)) for row in zip(*[strings] * width)]
+
+    records = []
+    for i in range(count):
+        record = {}
+        for key, kind in zip(keys, types[i * width:(i + 1) * width]):
+            if kind == STRING:
+                record[key] = next(strings)
+            elif kind == NULL:
+                record[key] = None
+            elif kind == OTHER:
+                record[key] = json.loads(next(strings))
+        records.append(record)
+    return records
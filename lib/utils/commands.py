@@ -0,0 +1,324 @@
+# lib/utils/commands.py
+
+# Handlers that turn parsed command-line arguments into controller calls
+
+# Requires
+import builtins
+import contextlib
+import io
+import json
+import shlex
+import sys
+import time
+from lib.utils import output, storage
+from lib.utils.args import COMMANDS, create_parser, find_command
+from lib.utils.console import console
+
+
+# Command names mapped to their handlers
+HANDLERS = {}
+
+
+# Register a handler for a command
+def handler(name):
+    def register(function):
+        HANDLERS[name] = function
+        return function
+    return register
+
+
+# Run the handler for a parsed command and return its result
+def dispatch(args, users_controller, projects_controller, tasks_controller):
+    function = HANDLERS.get(args.command)
+    if function is None:
+        print(f"Unknown command: {args.command}")
+        return None
+    return function(args, users_controller, projects_controller, tasks_controller)
+
+
+# Copy the options that were given into an update dictionary
+def _updates(args, fields):
+    update_args = {"id": args.id}
+    for field in fields:
+        if getattr(args, field):
+            update_args[field] = getattr(args, field)
+    return update_args
+
+
+@handler("add-user")
+def add_user(args, users_controller, projects_controller, tasks_controller):
+    return users_controller.add_user({"name": args.name, "email": args.email})
+
+
+@handler("list-users")
+def list_users(args, users_controller, projects_controller, tasks_controller):
+    return users_controller.list_users({"limit": args.limit, "after": args.after, "format": args.output_format})
+
+
+@handler("get-user")
+def get_user(args, users_controller, projects_controller, tasks_controller):
+    return users_controller.get_user({"id": args.id, "email": args.email, "format": args.output_format}, projects_controller, tasks_controller)
+
+
+@handler("update-user")
+def update_user(args, users_controller, projects_controller, tasks_controller):
+    return users_controller.update_user(_updates(args, ["name", "email"]))
+
+
+@handler("delete-user")
+def delete_user(args, users_controller, projects_controller, tasks_controller):
+    return users_controller.delete_user({"id": args.id})
+
+
+@handler("add-project")
+def add_project(args, users_controller, projects_controller, tasks_controller):
+    return projects_controller.add_project({
+        "assigned_to_id": args.assigned_to_id,
+        "title": args.title,
+        "description": args.description,
+        "due_date": args.due_date
+    }, users_controller)
+
+
+@handler("list-projects")
+def list_projects(args, users_controller, projects_controller, tasks_controller):
+    return projects_controller.list_projects(users_controller, {"limit": args.limit, "after": args.after, "format": args.output_format})
+
+
+@handler("get-project")
+def get_project(args, users_controller, projects_controller, tasks_controller):
+    return projects_controller.get_project({"id": args.id, "format": args.output_format}, users_controller, tasks_controller)
+
+
+@handler("update-project")
+def update_project(args, users_controller, projects_controller, tasks_controller):
+    return projects_controller.update_project(_updates(args, ["title", "description", "due_date", "status"]))
+
+
+@handler("delete-project")
+def delete_project(args, users_controller, projects_controller, tasks_controller):
+    return projects_controller.delete_project({"id": args.id})
+
+
+@handler("add-task")
+def add_task(args, users_controller, projects_controller, tasks_controller):
+    return tasks_controller.add_task({"project_id": args.project_id, "title": args.title}, projects_controller)
+
+
+@handler("list-tasks")
+def list_tasks(args, users_controller, projects_controller, tasks_controller):
+    return tasks_controller.list_tasks(projects_controller, {
+        "limit": args.limit,
+        "after": args.after,
+        "status": args.status,
+        "project_id": args.project_id,
+        "format": args.output_format
+    })
+
+
+@handler("task-stats")
+def task_stats(args, users_controller, projects_controller, tasks_controller):
+    return tasks_controller.task_stats({"format": args.output_format})
+
+
+@handler("get-task")
+def get_task(args, users_controller, projects_controller, tasks_controller):
+    return tasks_controller.get_task({"id": args.id, "format": args.output_format}, projects_controller)
+
+
+@handler("update-task")
+def update_task(args, users_controller, projects_controller, tasks_controller):
+    return tasks_controller.update_task(_updates(args, ["title", "status"]))
+
+
+@handler("delete-task")
+def delete_task(args, users_controller, projects_controller, tasks_controller):
+    return tasks_controller.delete_task({"id": args.id})
+
+
+# Read an import file into a controller and write rejected rows to the errors file
+def _import(args, noun, load):
+    from lib.utils import imports
+    rejected = []
+    start = time.perf_counter()
+    # Rows are read as they are imported; a read error part-way through stops
+    # the command, and the group commit discards the rows added before it
+    try:
+        imported = load(imports.read_rows(args.file, rejected, args.input_format), rejected)
+    except (IOError, UnicodeDecodeError) as error:
+        raise storage.StorageError(f"Could not read {args.file}: {error}") from error
+    elapsed = time.perf_counter() - start
+
+    rows = len(imported) + len(rejected)
+    rate = rows / elapsed if elapsed else 0
+    console.print(f"[green]✓ Success:[/green] Imported {len(imported)} {noun}, rejected {len(rejected)} in {elapsed:.2f}s ({rate:.0f} rows/s).")
+    if rejected:
+        errors_file = args.errors or imports.errors_path(args.file)
+        imports.write_errors(errors_file, rejected)
+        console.print(f"[yellow]⚠ Warning:[/yellow] Rejected rows written to {errors_file}.")
+    return imported
+
+
+@handler("import-users")
+def import_users(args, users_controller, projects_controller, tasks_controller):
+    return _import(args, "users", users_controller.import_users)
+
+
+@handler("import-projects")
+def import_projects(args, users_controller, projects_controller, tasks_controller):
+    return _import(args, "projects", lambda rows, rejected: projects_controller.import_projects(rows, rejected, users_controller))
+
+
+@handler("import-tasks")
+def import_tasks(args, users_controller, projects_controller, tasks_controller):
+    return _import(args, "tasks", lambda rows, rejected: tasks_controller.import_tasks(rows, rejected, projects_controller))
+
+
+# Stream the denormalized dataset to a file or stdout
+@handler("export")
+def export(args, users_controller, projects_controller, tasks_controller):
+    from lib.utils.export import export_rows
+    output_format = "jsonl" if args.output_format == "table" else args.output_format
+    start = time.perf_counter()
+    count = 0
+
+    # Count rows as they pass through to the writer
+    def counted(rows):
+        nonlocal count
+        for count, row in enumerate(rows, start=1):
+            yield row
+
+    rows = counted(export_rows(users_controller, projects_controller, tasks_controller))
+    try:
+        if args.file == "-":
+            output.write_records(rows, output_format)
+        else:
+            with open(args.file, 'w', newline="", encoding="utf-8") as file:
+                output.write_records(rows, output_format, file)
+    except IOError as error:
+        print(f"Error exporting to {'stdout' if args.file == '-' else args.file}: {error}", file=sys.stderr)
+        return None
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0
+    print(f"Exported {count} row(s) in {elapsed:.2f}s ({rate:.0f} rows/s)", file=sys.stderr)
+    return count
+
+
+# Import JSON files into SQLite
+@handler("migrate")
+def migrate(args, users_controller, projects_controller, tasks_controller):
+    from lib.utils.sqlite_storage import import_json
+    database_file = args.database or storage.get_settings("database_file", "data/projects.db")
+    counts = import_json(database_file, {
+        "users": users_controller.file_path,
+        "projects": projects_controller.file_path,
+        "tasks": tasks_controller.file_path
+    })
+    print(f"Imported {counts['users']} users, {counts['projects']} projects and {counts['tasks']} tasks into {database_file}")
+    return counts
+
+
+# Fold journal logs into snapshots
+@handler("compact")
+def compact(args, users_controller, projects_controller, tasks_controller):
+    compacted = []
+    for controller in [users_controller, projects_controller, tasks_controller]:
+        if not hasattr(controller.backend, "compact"):
+            print("Compaction only applies to the journal storage backend")
+            return None
+        if controller.backend.compact(controller):
+            print(f"Compacted {controller.file_path}")
+            compacted.append(controller.file_path)
+    return compacted
+
+
+# Read batch operations from a file, or stdin for "-"
+def batch_lines(path):
+    if path == "-":
+        yield from sys.stdin
+        return
+    with open(path, 'r') as file:
+        yield from file
+
+
+# Turn a batch line into command-line arguments
+# Lines are either command lines ("add-task --project-id ID --title Title")
+# or JSON objects ({"command": "add-task", "project_id": "ID", "title": "Title"})
+def _batch_argv(line):
+    if line.startswith("{"):
+        operation = json.loads(line)
+        argv = [operation.pop("command")]
+        for key, value in operation.items():
+            argv += [f"--{key.replace('_', '-')}", str(value)]
+        return argv
+    return shlex.split(line)
+
+
+# Describe what an operation returned
+def _batch_detail(result):
+    if isinstance(result, list):
+        return f"{len(result)} record(s)"
+    return getattr(result, "id", "")
+
+
+# Run many commands against the open controllers, saving once at the end
+@handler("batch")
+def batch(args, users_controller, projects_controller, tasks_controller):
+    lines = args.lines if getattr(args, "lines", None) is not None else batch_lines(args.file)
+    answer = "y" if args.yes else "n"
+    parsers = {}
+    succeeded = failed = 0
+    start = time.perf_counter()
+
+    # Delete confirmations are answered by --yes instead of reading stdin
+    original_input = builtins.input
+    builtins.input = lambda prompt="": answer
+    try:
+        # Captured messages are never shown with colours, so skip rendering markup
+        with console.plain():
+            for line_number, line in enumerate(lines, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                # Controller messages are captured and only shown for failures
+                captured = io.StringIO()
+                result = message = None
+                command = "?"
+                with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+                    try:
+                        argv = _batch_argv(line)
+                        command = find_command(argv) or argv[0]
+                        if command in ("batch", "daemon"):
+                            print(f"{command} cannot run inside a batch")
+                        else:
+                            # Reuse one parser per command
+                            if command not in parsers:
+                                parsers[command] = create_parser(argv if command in COMMANDS else None)
+                            result = dispatch(parsers[command].parse_args(argv), users_controller, projects_controller, tasks_controller)
+                    except SystemExit:
+                        # The parser printed usage followed by the error
+                        lines_printed = captured.getvalue().strip().splitlines()
+                        message = lines_printed[-1] if lines_printed else None
+                    except storage.StorageError:
+                        # Files that cannot be read or written stop the whole batch unsaved
+                        raise
+                    except Exception as error:
+                        print(error)
+
+                if result is not None:
+                    succeeded += 1
+                    print(f"{line_number}\tok\t{command}\t{_batch_detail(result)}")
+                else:
+                    failed += 1
+                    message = message or " ".join(captured.getvalue().split()) or "failed"
+                    print(f"{line_number}\terror\t{command}\t{message}")
+    finally:
+        builtins.input = original_input
+
+    elapsed = time.perf_counter() - start
+    total = succeeded + failed
+    rate = total / elapsed if elapsed else 0
+    print(f"{succeeded} succeeded, {failed} failed, {total} operation(s) in {elapsed:.2f}s ({rate:.0f}/s)", file=sys.stderr)
+    return {"succeeded": succeeded, "failed": failed}
@@ -0,0 +1,66 @@
+# lib/utils/console.py
+
+# Shared rich console, imported and created on first use
+# Importing rich is a large part of startup time, so commands that never
+# print rich output (help, machine-readable formats) skip it entirely.
+
+# Requires
+import contextlib
+import re
+import sys
+
+# Rich markup tags such as [red] and [/bold cyan]
+MARKUP = re.compile(r"\[/?[a-z0-9_ #]*\]")
+
+
+class LazyConsole:
+    def __init__(self):
+        self._console = None
+        self._plain = False
+
+
+    # Create the rich console the first time it is needed
+    def _get(self):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+
+    # Pass method calls through to the rich console
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+    # Print through rich, or as plain text inside plain()
+    def print(self, *objects, **kwargs):
+        if self._plain and all(isinstance(item, str) for item in objects):
+            sys.stdout.write(MARKUP.sub("", " ".join(objects)) + "\n")
+            return
+        self._get().print(*objects, **kwargs)
+
+
+    # Write messages without rendering markup, for output that is not shown as is
+    @contextlib.contextmanager
+    def plain(self):
+        previous, self._plain = self._plain, True
+        try:
+            yield
+        finally:
+            self._plain = previous
+
+
+    # Set the width tables are fitted to, e.g. a daemon client's terminal
+    def resize(self, width):
+        self._get().width = width
+
+
+# Create a rich table in the style used by every listing
+def new_table(title=None):
+    from rich.table import Table
+    from rich import box
+    return Table(title=title, box=box.SIMPLE, show_header=True)
+
+
+# Console instance
+console = LazyConsole()
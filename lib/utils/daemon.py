@@ -0,0 +1,301 @@
+# lib/utils/daemon.py
+
+# Daemon mode: one process keeps the controllers loaded and serves commands
+# from CLI clients over a Unix domain socket.
+# Each request is one JSON line with the parsed arguments. The daemon answers
+# with JSON lines carrying printed output ("out"/"err"), confirmation prompts
+# ("prompt", answered by the client with an "input" line) and a final "done".
+# Changes are written behind: the daemon flushes once the oldest unsaved
+# change is flush_seconds old, and again when it shuts down.
+
+# Requires
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from lib.utils import commands, storage
+from lib.utils.console import console
+
+# Printed output is sent in chunks of about this many characters
+CHUNK_SIZE = 65536
+
+
+# Check that this platform has Unix domain sockets
+def supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+# Connect to a running daemon, or return None to run the command directly
+def connect(socket_path):
+    if not supported() or not os.path.exists(socket_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        # Socket file left behind by a daemon that is no longer running
+        client.close()
+        return None
+    return client
+
+
+# Send parsed arguments to the daemon and relay its output until it is done
+def request(client, args, stdout=None, stderr=None, prompt=None):
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    prompt = prompt or input
+
+    with client, client.makefile("rw", encoding="utf-8", newline="\n") as stream:
+        _send(stream, {"args": args, "columns": _columns(stdout)})
+        for line in stream:
+            message = json.loads(line)
+            if "out" in message:
+                try:
+                    stdout.write(message["out"])
+                except BrokenPipeError:
+                    # Output piped to a program that stopped reading, such as head
+                    _discard(stdout)
+                    return True
+            elif "err" in message:
+                stderr.write(message["err"])
+            elif "prompt" in message:
+                stdout.flush()
+                try:
+                    answer = prompt(message["prompt"])
+                except EOFError:
+                    answer = ""
+                _send(stream, {"input": answer})
+            elif "done" in message:
+                return True
+
+    # Daemon stopped in the middle of the command
+    print("Daemon closed the connection before the command finished", file=stderr)
+    return False
+
+
+# Get the width of the terminal the client prints to, if it is one
+def _columns(stream):
+    try:
+        return os.get_terminal_size(stream.fileno()).columns
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+# Send anything still buffered for a closed stream to devnull instead,
+# so flushing it at exit does not fail again
+def _discard(stream):
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, stream.fileno())
+        os.close(devnull)
+    except (AttributeError, ValueError, OSError):
+        pass
+
+
+# Write one JSON message line
+def _send(stream, message):
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+# File-like object that forwards printed text to the client
+class _Relay:
+    def __init__(self, stream, kind):
+        self.stream = stream
+        self.kind = kind
+        self._buffer = []
+        self._size = 0
+
+
+    def write(self, text):
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= CHUNK_SIZE:
+            self.flush()
+        return len(text)
+
+
+    def flush(self):
+        if self._buffer:
+            _send(self.stream, {self.kind: "".join(self._buffer)})
+            self._buffer.clear()
+            self._size = 0
+
+
+    def isatty(self):
+        return False
+
+
+class Daemon:
+    def __init__(self, socket_path, users_controller, projects_controller, tasks_controller, flush_seconds=1.0):
+        self.socket_path = socket_path
+        self.controllers = [users_controller, projects_controller, tasks_controller]
+        self.flush_seconds = flush_seconds
+        self.requests = 0
+        self._dirty_since = None
+        self._server = None
+
+
+    # Load every data file once and listen on the socket
+    def start(self):
+        for controller in self.controllers:
+            controller.data
+
+        if connect(self.socket_path):
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        self._server.listen()
+        # Wake up regularly to write changes behind
+        self._server.settimeout(self.flush_seconds)
+
+
+    # Serve requests one at a time until interrupted, then save and clean up
+    def serve_forever(self):
+        try:
+            while (server := self._server) is not None:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    self.flush_due()
+                    continue
+                except OSError:
+                    # Socket closed by stop()
+                    break
+                with connection:
+                    connection.settimeout(None)
+                    try:
+                        self.handle(connection)
+                    except (OSError, ValueError, KeyError, TypeError) as error:
+                        # A client that goes away or sends a bad request only loses its own connection
+                        print(f"Request failed: {error!r}", file=sys.stderr)
+                self.flush_due()
+        finally:
+            self.stop()
+
+
+    # Stop listening and write any remaining changes
+    def stop(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+
+        # Shutting down wakes a thread blocked in accept()
+        try:
+            server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self.flush()
+
+
+    # Run one client's command with its output and prompts relayed over the socket
+    def handle(self, connection):
+        try:
+            self._run(connection)
+        finally:
+            # Changes are written behind even if the client went away mid-command
+            if self._dirty_since is None and any(controller.dirty for controller in self.controllers):
+                self._dirty_since = time.monotonic()
+
+
+    # Read one request, run it and send back its output
+    def _run(self, connection):
+        with connection.makefile("rw", encoding="utf-8", newline="\n") as stream:
+            line = stream.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            args = argparse.Namespace(**message["args"])
+
+            # Size tables for the client's terminal
+            if message.get("columns"):
+                console.resize(message["columns"])
+
+            # Migrations read the data files, so they must be up to date
+            if args.command == "migrate":
+                self.flush()
+
+            out, err = _Relay(stream, "out"), _Relay(stream, "err")
+
+            # Confirmation prompts are answered by the client
+            def relay_input(text=""):
+                out.flush()
+                err.flush()
+                _send(stream, {"prompt": text})
+                answer = stream.readline()
+                return json.loads(answer)["input"] if answer else ""
+
+            original_input = builtins.input
+            builtins.input = relay_input
+            try:
+                with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                    try:
+                        commands.dispatch(args, *self.controllers)
+                    except Exception as error:
+                        print(f"Error running {args.command}: {error}", file=sys.stderr)
+                    if args.verbose:
+                        queued = [controller.file_path for controller in self.controllers if controller.dirty]
+                        print(f"Queued {len(queued)} file(s) for write-behind: {', '.join(queued) or 'none'}")
+            finally:
+                builtins.input = original_input
+
+            out.flush()
+            err.flush()
+            _send(stream, {"done": True})
+
+        self.requests += 1
+
+
+    # Flush once the oldest unsaved change has waited long enough
+    def flush_due(self):
+        if self._dirty_since is not None and time.monotonic() - self._dirty_since >= self.flush_seconds:
+            self.flush()
+
+
+    # Write all changed data files in one group commit
+    # If any file fails, none are written and the changes are tried again later
+    def flush(self):
+        try:
+            with storage.group_commit():
+                for controller in self.controllers:
+                    controller.flush()
+        except storage.StorageError as error:
+            print(error, file=sys.stderr)
+            self._dirty_since = time.monotonic()
+            return False
+        self._dirty_since = None
+        return True
+
+
+# Run a daemon in the foreground until interrupted
+def serve(socket_path, users_controller, projects_controller, tasks_controller, flush_seconds=1.0):
+    if not supported():
+        print("Daemon mode needs Unix domain sockets, which this platform does not have")
+        return
+
+    daemon = Daemon(socket_path, users_controller, projects_controller, tasks_controller, flush_seconds)
+    try:
+        daemon.start()
+    except (RuntimeError, storage.StorageError) as error:
+        print(error)
+        return
+
+    # Stop cleanly (saving changes) when terminated
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Daemon listening on {socket_path}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Daemon stopped after {daemon.requests} request(s)")
@@ -0,0 +1,68 @@
+# lib/utils/export.py
+
+# Denormalized export of users with their projects and tasks
+# Rows are produced one at a time from the controllers' foreign key
+# indexes, so nothing beyond the loaded records is held in memory.
+
+# Columns of every exported row
+FIELDS = [
+    "user_id", "user_name", "user_email",
+    "project_id", "project_title", "project_description", "project_due_date", "project_status",
+    "task_id", "task_title", "task_status"
+]
+
+# Empty columns for users without projects, projects without tasks,
+# and projects or tasks whose owner no longer exists
+NO_USER = {"user_id": "", "user_name": "", "user_email": ""}
+NO_PROJECT = {"project_id": "", "project_title": "", "project_description": "", "project_due_date": "", "project_status": ""}
+NO_TASK = {"task_id": "", "task_title": "", "task_status": ""}
+
+
+# Yield one row per task, joined to its project and user
+# Users without projects and projects without tasks still get one row each
+def export_rows(users_controller, projects_controller, tasks_controller):
+    # Load everything once so each join below is an index lookup
+    users_controller.data, projects_controller.data, tasks_controller.data
+
+    for user in users_controller.data:
+        user_columns = {"user_id": user.id, "user_name": user.name, "user_email": user.email}
+        projects = projects_controller.find_by("assigned_to_id", user._id)
+        if not projects:
+            yield {**user_columns, **NO_PROJECT, **NO_TASK}
+            continue
+
+        for project in projects:
+            yield from _project_rows(user_columns, project, tasks_controller)
+
+    # Deleting a user or project leaves its projects or tasks behind, so export those with empty columns
+    for project in projects_controller.data:
+        if users_controller.find_by_id(project.assigned_to_id) is None:
+            yield from _project_rows(NO_USER, project, tasks_controller)
+
+    for task in tasks_controller.data:
+        if projects_controller.find_by_id(task.project_id) is None:
+            yield {**NO_USER, **NO_PROJECT, **_task_columns(task)}
+
+
+# Yield the rows of one project and its tasks
+def _project_rows(user_columns, project, tasks_controller):
+    project_columns = {
+        **user_columns,
+        "project_id": project.id,
+        "project_title": project.title,
+        "project_description": project.description,
+        "project_due_date": project.due_date,
+        "project_status": project.status
+    }
+    tasks = tasks_controller.find_by("project_id", project._id)
+    if not tasks:
+        yield {**project_columns, **NO_TASK}
+        return
+
+    for task in tasks:
+        yield {**project_columns, **_task_columns(task)}
+
+
+# Columns of one task
+def _task_columns(task):
+    return {"task_id": task.id, "task_title": task.title, "task_status": task.status}
@@ -0,0 +1,53 @@
+# lib/utils/imports.py
+
+# Streaming readers for bulk imports and the file of rejected rows
+
+# Requires
+import csv
+import json
+import os
+
+# Supported import file formats
+FORMATS = ["csv", "jsonl"]
+
+
+# Guess the format of an import file from its extension
+def detect_format(filepath):
+    return "csv" if filepath.lower().endswith(".csv") else "jsonl"
+
+
+# Yield (line number, row) pairs from a CSV or JSON Lines file
+# Lines that cannot be read are added to rejected instead
+def read_rows(filepath, rejected, input_format=None):
+    input_format = input_format or detect_format(filepath)
+    with open(filepath, 'r', newline="", encoding="utf-8") as file:
+        if input_format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                rejected.append((line_number, line.rstrip("\n"), f"Unreadable JSON: {error}"))
+                continue
+            if not isinstance(row, dict):
+                rejected.append((line_number, row, "Each line must be a JSON object."))
+                continue
+            yield line_number, row
+
+
+# Default path for the rejected rows of an import file
+def errors_path(filepath):
+    return f"{os.path.splitext(filepath)[0]}.errors.jsonl"
+
+
+# Write rejected rows as JSON Lines with their line numbers and reasons
+def write_errors(filepath, rejected):
+    with open(filepath, 'w', encoding="utf-8") as file:
+        for line_number, row, error in rejected:
+            file.write(json.dumps({"line": line_number, "error": error, "row": row}) + "\n")
@@ -0,0 +1,98 @@
+# lib/utils/journal_storage.py
+
+# Append-only journal storage backend
+# Each data file is a JSON snapshot plus a .log file of changes made since.
+# Saving appends one line per changed or deleted record, and the log is
+# folded back into the snapshot once it grows past a size threshold.
+
+# Requires
+import json
+import os
+from lib.utils import storage
+
+
+# Get the log file path for a data file
+def log_path(filepath):
+    return f"{filepath}.log"
+
+
+# Replay log entries on top of records keyed by ID
+def replay(records, filepath):
+    path = log_path(filepath)
+    if not os.path.exists(path):
+        return records
+
+    # Only a partial last entry left by a crash mid-append is skipped
+    try:
+        for entry in storage.iter_lines(path):
+            if entry["op"] == "put":
+                records[entry["record"]["id"]] = entry["record"]
+            elif entry["op"] == "delete":
+                records.pop(entry["id"], None)
+    except (ValueError, UnicodeDecodeError, IOError) as error:
+        raise storage.StorageError(f"Error loading data from {path}: {error}") from error
+    return records
+
+
+class JournalStorage:
+    # Records are only known after replaying the whole log
+    partial = False
+    queries = False
+
+    def __init__(self, compact_bytes=1_000_000, data_format="json"):
+        self.compact_bytes = compact_bytes
+        self.data_format = data_format
+
+
+    # Load snapshot records and apply the log
+    def load(self, controller):
+        records = {record["id"]: record for record in storage.load_data(controller.file_path)}
+        return list(replay(records, controller.file_path).values())
+
+
+    # Append changed and deleted records to the log
+    # Inside a group commit the append waits until the other files are in place
+    def save(self, controller):
+        added, updated, deleted = controller.pending_changes()
+        lines = [json.dumps({"op": "put", "record": record.to_dict()}) for record in added + updated]
+        lines += [json.dumps({"op": "delete", "id": record_id}) for record_id in deleted]
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+        directory = os.path.dirname(controller.file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        path = log_path(controller.file_path)
+
+        def append():
+            try:
+                with storage.open_append(path) as file:
+                    file.write(payload)
+                    file.flush()
+                    os.fsync(file.fileno())
+            except IOError as error:
+                raise storage.StorageError(f"Error saving data to {path}: {error}") from error
+
+            # Fold the log into the snapshot once it gets large
+            # The changes are already in the log, so a failed snapshot only postpones this
+            if os.path.getsize(path) > self.compact_bytes:
+                try:
+                    self.compact(controller)
+                except storage.StorageError as error:
+                    print(error)
+
+        storage.after_commit(append)
+
+
+    # Write a new snapshot and remove the log
+    def compact(self, controller):
+        path = log_path(controller.file_path)
+        if not os.path.exists(path):
+            return False
+
+        # Snapshot first so a crash before removing the log only replays it again
+        # The log is only removed once the snapshot is committed: save_data raises
+        # if it cannot be written, and a failed group commit runs no callbacks
+        storage.save_data(controller.file_path, [record.to_dict() for record in controller.data], self.data_format)
+        storage.after_commit(lambda: os.remove(path))
+        return True
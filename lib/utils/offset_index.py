@@ -0,0 +1,84 @@
+# lib/utils/offset_index.py
+
+# Sidecar index mapping record IDs to byte ranges in a data file
+# Layout: magic, header (data file size, data file mtime, entry count) and
+# fixed-size entries (ID hash, offset, length) sorted by hash. Lookups
+# binary search the entries through mmap and decode only one record.
+
+# Requires
+import json
+import mmap
+import os
+import struct
+
+# File signature and record layouts
+MAGIC = b"PMIDX1\n"
+HEADER = struct.Struct("<QqI")
+ENTRY = struct.Struct("<QQI")
+
+
+# Get the index file path for a data file
+def index_path(filepath):
+    return f"{filepath}.idx"
+
+
+# Hash an ID to a fixed-size key
+def _key(record_id):
+    # Most commands never touch the index, so hashlib is imported on first use
+    from hashlib import blake2b
+    return int.from_bytes(blake2b(str(record_id).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# Build index bytes for records at known byte ranges in a data file
+def encode(records, spans, size, mtime_ns):
+    entries = sorted(
+        (_key(record["id"]), offset, length) for record, (offset, length) in zip(records, spans)
+    )
+    return b"".join(
+        [MAGIC, HEADER.pack(size, mtime_ns, len(entries))] + [ENTRY.pack(*entry) for entry in entries]
+    )
+
+
+# Look up one record by ID
+# Returns (True, record or None) when the index is current, (False, None) when it cannot be used
+def lookup(filepath, record_id):
+    path = index_path(filepath)
+    if not os.path.exists(path) or not os.path.exists(filepath):
+        return False, None
+
+    stat = os.stat(filepath)
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < len(MAGIC) + HEADER.size:
+            return False, None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            if index[:len(MAGIC)] != MAGIC:
+                return False, None
+
+            # Index must describe the data file as it is now
+            size, mtime_ns, count = HEADER.unpack_from(index, len(MAGIC))
+            if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                return False, None
+
+            # Binary search for the first entry with this key
+            key = _key(record_id)
+            start = len(MAGIC) + HEADER.size
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                if ENTRY.unpack_from(index, start + middle * ENTRY.size)[0] < key:
+                    low = middle + 1
+                else:
+                    high = middle
+
+            # Check every entry sharing the key in case of hash collisions
+            with open(filepath, 'rb') as data_file:
+                while low < count:
+                    entry_key, offset, length = ENTRY.unpack_from(index, start + low * ENTRY.size)
+                    if entry_key != key:
+                        break
+                    data_file.seek(offset)
+                    record = json.loads(data_file.read(length))
+                    if record.get("id") == record_id:
+                        return True, record
+                    low += 1
+    return True, None
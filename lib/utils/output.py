@@ -0,0 +1,127 @@
+# lib/utils/output.py
+
+# Machine-readable output that streams records straight to stdout
+# without building rich tables
+
+# Requires
+import contextlib
+import csv
+import json
+import os
+import sys
+from itertools import chain, islice
+
+# Supported output formats (table is the rich default)
+FORMATS = ["table", "json", "jsonl", "tsv", "csv"]
+
+# Tables with more rows than this are streamed instead of built with rich
+STREAM_THRESHOLD = 1000
+
+# Rows used to size streamed columns, and the widest a column can get
+SAMPLE_SIZE = 100
+MAX_WIDTH = 40
+
+
+# Write records (dictionaries) to a stream in a machine-readable format
+def write_records(records, output_format, stream=None):
+    stream = stream or sys.stdout
+
+    if output_format == "jsonl":
+        for record in records:
+            stream.write(json.dumps(record) + "\n")
+        return
+
+    if output_format == "json":
+        # Write the array one element at a time
+        separator = "[\n  "
+        for record in records:
+            stream.write(separator + json.dumps(record))
+            separator = ",\n  "
+        stream.write("[]\n" if separator.startswith("[") else "\n]\n")
+        return
+
+    # Delimited formats take their columns from the first record's scalar fields
+    writer = None
+    for record in records:
+        if writer is None:
+            fields = [key for key, value in record.items() if not isinstance(value, (list, dict))]
+            writer = csv.DictWriter(
+                stream,
+                fieldnames=fields,
+                delimiter="\t" if output_format == "tsv" else ",",
+                lineterminator="\n",
+                extrasaction="ignore"
+            )
+            writer.writeheader()
+        writer.writerow(record)
+
+
+# Tell the reader how to get the next page without mixing it into the records
+def write_next_page(cursor):
+    print(f"Next page: --after {cursor}", file=sys.stderr)
+
+
+# Fit a cell to a fixed width, marking cut text with an ellipsis
+def _fit(cell, width):
+    if len(cell) > width:
+        return cell[:width - 1] + "…"
+    return cell.ljust(width)
+
+
+# Print a plain fixed-width table one row at a time
+# Column widths come from the first rows unless given, so the first
+# screen is written before the remaining rows are even formatted
+def stream_table(title, headers, rows, widths=None, stream=None):
+    stream = stream or sys.stdout
+    rows = iter(rows)
+    sample = list(islice(rows, SAMPLE_SIZE))
+    if widths is None:
+        widths = [
+            min(max([len(header)] + [len(row[column]) for row in sample]), MAX_WIDTH)
+            for column, header in enumerate(headers)
+        ]
+
+    stream.write(f"{title}\n\n")
+    stream.write("  ".join(_fit(header, width) for header, width in zip(headers, widths)).rstrip() + "\n")
+    stream.write("  ".join("─" * width for width in widths) + "\n")
+    stream.flush()
+    for row in chain(sample, rows):
+        stream.write("  ".join(_fit(cell, width) for cell, width in zip(row, widths)).rstrip() + "\n")
+
+
+# Send everything printed inside the block through a pager when on a terminal
+@contextlib.contextmanager
+def pager(command=None):
+    if not sys.stdout.isatty():
+        yield
+        return
+
+    # Only paged commands pay for importing subprocess
+    import shlex
+    import subprocess
+    try:
+        process = subprocess.Popen(
+            shlex.split(command or os.environ.get("PAGER", "less -SR")),
+            stdin=subprocess.PIPE,
+            text=True,
+            encoding="utf-8"
+        )
+    except OSError:
+        # No pager available, print directly
+        yield
+        return
+
+    original = sys.stdout
+    sys.stdout = process.stdin
+    try:
+        yield
+    except BrokenPipeError:
+        # Pager was closed before all rows were written
+        pass
+    finally:
+        sys.stdout = original
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
\ No newline at end of file
@@ -0,0 +1,139 @@
+# lib/utils/sqlite_storage.py
+
+# SQLite storage backend
+# Controllers read single records and write only changed rows
+
+# Requires
+import os
+import sqlite3
+from lib.utils import storage
+
+
+# Columns stored for each table
+TABLES = {
+    "users": ["id", "name", "email"],
+    "projects": ["id", "assigned_to_id", "title", "description", "due_date", "status"],
+    "tasks": ["id", "project_id", "title", "status"]
+}
+
+# Schema with indexes on IDs, foreign keys and email
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    email TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    assigned_to_id TEXT,
+    title TEXT,
+    description TEXT,
+    due_date TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS projects_assigned_to_id ON projects (assigned_to_id);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    project_id TEXT,
+    title TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_project_id ON tasks (project_id);
+"""
+
+
+class SqliteStorage:
+    # Single records and indexed fields can be read without loading the whole table
+    partial = True
+    queries = True
+
+    def __init__(self, database_file):
+        self.database_file = database_file
+        self._connection = None
+
+
+    # Open the database and create tables on first use
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.database_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._connection = sqlite3.connect(self.database_file)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+
+    # Load all records for a controller in insertion order
+    def load(self, controller):
+        columns = ", ".join(TABLES[controller.table])
+        cursor = self.connection.execute(f"SELECT {columns} FROM {controller.table} ORDER BY rowid")
+        return [dict(row) for row in cursor]
+
+
+    # Load one record by ID
+    def get(self, controller, record_id):
+        columns = ", ".join(TABLES[controller.table])
+        row = self.connection.execute(
+            f"SELECT {columns} FROM {controller.table} WHERE id = ?", (record_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+    # Load records where an indexed field matches a value
+    def query(self, controller, field, value):
+        columns = TABLES[controller.table]
+        if field not in columns:
+            raise ValueError(f"Unknown field {field} for table {controller.table}")
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(columns)} FROM {controller.table} WHERE {field} = ? ORDER BY rowid", (value,)
+        )
+        return [dict(row) for row in cursor]
+
+
+    # Load records ordered by ID, starting after a cursor
+    def page(self, controller, after=None, limit=None):
+        columns = ", ".join(TABLES[controller.table])
+        where = "WHERE id > ?" if after is not None else ""
+        parameters = ([after] if after is not None else []) + [limit if limit else -1]
+        cursor = self.connection.execute(
+            f"SELECT {columns} FROM {controller.table} {where} ORDER BY id LIMIT ?", parameters
+        )
+        return [dict(row) for row in cursor]
+
+
+    # Write changed rows and remove deleted ones in one transaction
+    def save(self, controller):
+        added, updated, deleted = controller.pending_changes()
+        with self.connection:
+            self.upsert(controller.table, [record.to_dict() for record in added + updated])
+            self.connection.executemany(
+                f"DELETE FROM {controller.table} WHERE id = ?", [(record_id,) for record_id in deleted]
+            )
+
+
+    # Insert rows, updating any that already exist
+    def upsert(self, table, rows):
+        columns = TABLES[table]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        self.connection.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+            [tuple(row.get(column) for column in columns) for row in rows]
+        )
+
+
+# Import JSON data files into a SQLite database
+def import_json(database_file, files):
+    backend = SqliteStorage(database_file)
+    counts = {}
+    with backend.connection:
+        for table, filepath in files.items():
+            rows = storage.load_data(filepath)
+            backend.upsert(table, rows)
+            counts[table] = len(rows)
+    return counts
@@ -1,8 +1,20 @@
 # utils/storage.py
 
 # Requires
+import contextlib
 import json
 import os
+import stat
+from lib.utils import binary_format, offset_index
+
+# Supported data file formats
+FORMATS = ["json", "compact", "binary", "jsonl"]
+
+
+# Raised when a data file cannot be read or written
+# The command stops and nothing it changed is committed
+class StorageError(Exception):
+    pass
 
 
 # Load settings from JSON file
@@ -22,29 +34,327 @@ def get_settings(key, default=None):
     return settings.get(key, default)
 
 
-# Load data from JSON file
-def load_data(filepath):
-    # Return empty list if file does not exist
+# Detect the format of a data file from its first bytes
+def detect_format(filepath):
     if not os.path.exists(filepath):
-        return []
+        return None
+    with open(filepath, 'rb') as file:
+        head = file.read(len(binary_format.MAGIC)).lstrip()
+        while not head:
+            chunk = file.read(4096)
+            if not chunk:
+                return None
+            head = chunk.lstrip()
+    if head.startswith(binary_format.MAGIC):
+        return "binary"
+    if head.startswith(b"{"):
+        return "jsonl"
+    return "json"
+
+
+# Yield records from a data file one at a time, detecting its format
+# A file that cannot be read raises StorageError, so the command stops
+# instead of carrying on with missing records and saving over the file
+def iter_data(filepath):
+    try:
+        data_format = detect_format(filepath)
+        
+        # JSON Lines files are read one line at a time
+        if data_format == "jsonl":
+            yield from iter_lines(filepath)
+            return
+        
+        if data_format is None:
+            return
+        with open(filepath, 'rb') as file:
+            payload = file.read()
+        if data_format == "binary":
+            yield from binary_format.decode(payload)
+        else:
+            yield from json.loads(payload)
+    except (json.JSONDecodeError, UnicodeDecodeError, ValueError, IOError) as error:
+        raise StorageError(f"Error loading data from {filepath}: {error}") from error
+
+
+# Yield the value on each line of a JSON Lines file
+# A crash mid-append can leave a partial last line with no newline, which is
+# skipped; an unreadable line anywhere else means the file is damaged
+def iter_lines(filepath):
+    with open(filepath, 'r') as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                if line.endswith("\n"):
+                    raise ValueError(f"line {line_number}: {error}") from None
+                print(f"Skipping unreadable line {line_number} in {filepath}")
+
+
+# Load data from a data file, detecting its format
+def load_data(filepath):
+    return list(iter_data(filepath))
+    
+
+# Temp files and callbacks waiting for the current group commit
+_pending = None
+
+
+# Serialize records in one of the supported formats
+def encode_data(data, data_format="json"):
+    if data_format == "binary":
+        return binary_format.encode(data)
+    if data_format == "compact":
+        return json.dumps(data, separators=(',', ':')).encode("utf-8")
+    if data_format == "jsonl":
+        return "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in data).encode("utf-8")
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+# Serialize records in a text format along with each record's byte range
+def encode_records(data, data_format="json"):
+    if data_format == "compact":
+        opening, separator, closing = b"[", b",", b"]"
+        pieces = [json.dumps(record, separators=(',', ':')).encode("utf-8") for record in data]
+    elif data_format == "jsonl":
+        opening, separator, closing = b"", b"", b""
+        pieces = [json.dumps(record, separators=(',', ':')).encode("utf-8") + b"\n" for record in data]
+    elif data:
+        # Same layout as json.dump(data, file, indent=2)
+        opening, separator, closing = b"[\n  ", b",\n  ", b"\n]"
+        pieces = [json.dumps(record, indent=2).replace("\n", "\n  ").encode("utf-8") for record in data]
+    else:
+        opening, separator, closing, pieces = b"[", b"", b"]", []
     
+    spans = []
+    position = len(opening)
+    for piece in pieces:
+        spans.append((position, len(piece)))
+        position += len(piece) + len(separator)
+    return opening + separator.join(pieces) + closing, spans
+
+
+# Permissions for a saved file: the existing file's, or the umask default for a new one
+def _file_mode(filepath):
     try:
-        with open(filepath, 'r') as file:
-            return json.load(file)
-    except (json.JSONDecodeError, IOError) as error:
-        print(f"Error loading data from {filepath}: {error}")
-        return []
+        return stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+# Write a synced temp file next to the target so a crash never truncates it
+def _write_temp(filepath, payload):
+    # Only commands that save pay for importing tempfile
+    import tempfile
     
+    directory = os.path.dirname(filepath)
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{os.path.basename(filepath)}.", suffix=".tmp")
+        # mkstemp creates the file as 0600, and the rename would keep that
+        os.chmod(temp_path, _file_mode(filepath))
+        with os.fdopen(fd, 'wb') as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        return temp_path
+    except (IOError) as error:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise StorageError(f"Error saving data to {filepath}: {error}") from error
 
-# Save data to JSON file
-def save_data(filepath, data):
+
+# Save data to a data file atomically, optionally with an offset index
+def save_data(filepath, data, data_format="json", index=False):
     # Create directory if it does not exist
     directory = os.path.dirname(filepath)
     if directory and not os.path.exists(directory):
         os.makedirs(directory)
     
+    if index and data_format != "binary":
+        payload, spans = encode_records(data, data_format)
+    else:
+        payload, spans = encode_data(data, data_format), None
+    
+    temp_path = _write_temp(filepath, payload)
+    files = [(temp_path, filepath)]
+    
+    # The index records the data file's size and mtime, which the rename keeps
+    if spans is not None:
+        file_stat = os.stat(temp_path)
+        index_payload = offset_index.encode(data, spans, file_stat.st_size, file_stat.st_mtime_ns)
+        try:
+            index_temp_path = _write_temp(offset_index.index_path(filepath), index_payload)
+        except StorageError:
+            os.remove(temp_path)
+            raise
+        files.append((index_temp_path, offset_index.index_path(filepath)))
+    
+    # Inside a group commit the rename waits until every file is written
+    if _pending is not None:
+        _pending["files"].extend(files)
+        return
+    _commit(files)
+
+
+# Append records to a JSON Lines file without rewriting it
+# Inside a group commit the append waits until the other files are in place
+def append_data(filepath, data):
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    payload = encode_data(data, "jsonl")
+    
+    def append():
+        try:
+            with open_append(filepath) as file:
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+        except (IOError) as error:
+            raise StorageError(f"Error saving data to {filepath}: {error}") from error
+    
+    after_commit(append)
+
+
+# Open a file of lines for appending, first cutting off a partial last line
+# left by a crash so that new lines are not joined onto it
+def open_append(filepath):
+    file = open(filepath, 'a+b')
     try:
-        with open(filepath, 'w') as file:
-            return json.dump(data, file, indent=2)
-    except (IOError) as error:
-        print(f"Error saving data to {filepath}: {error}")
\ No newline at end of file
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            file.truncate(position)
+    except BaseException:
+        file.close()
+        raise
+    return file
+
+
+# Run a callback once the current group commit is in place (or now if none)
+def after_commit(callback):
+    if _pending is not None:
+        _pending["callbacks"].append(callback)
+    else:
+        callback()
+
+
+# Commit all files saved inside the block together
+# If the block raises, nothing is committed and the temp files are removed
+@contextlib.contextmanager
+def group_commit():
+    global _pending
+    
+    # Nested groups join the outer one
+    if _pending is not None:
+        yield
+        return
+    
+    _pending = {"files": [], "callbacks": []}
+    try:
+        yield
+    except BaseException:
+        pending, _pending = _pending, None
+        for temp_path, _ in pending["files"]:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+    
+    pending, _pending = _pending, None
+    _commit(pending["files"])
+    for callback in pending["callbacks"]:
+        callback()
+
+
+# Rename temp files into place and sync each directory once
+def _commit(files):
+    for temp_path, filepath in files:
+        os.replace(temp_path, filepath)
+    for directory in {os.path.dirname(filepath) or "." for _, filepath in files}:
+        _sync_directory(directory)
+
+
+# Make renames in a directory durable
+def _sync_directory(directory):
+    # Directories cannot be opened for syncing on Windows
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Returned by backends that cannot look up a single record right now
+NOT_INDEXED = object()
+
+
+# Whole-file JSON storage used by the controllers
+class JsonStorage:
+    # Fields cannot be queried without loading the whole file
+    queries = False
+
+    def __init__(self, data_format="json", index=False):
+        self.data_format = data_format
+        self.index = index
+        
+        # Single records can be read through the offset index
+        self.partial = index
+
+
+    # Stream all records for a controller
+    def load(self, controller):
+        return iter_data(controller.file_path)
+
+
+    # Read one record through the offset index
+    def get(self, controller, record_id):
+        usable, record = offset_index.lookup(controller.file_path, record_id)
+        return record if usable else NOT_INDEXED
+
+
+    # Save the controller's records, appending new ones to JSON Lines files
+    def save(self, controller):
+        # New records can be appended to a JSON Lines file as single lines
+        added, updated, deleted = controller.pending_changes()
+        if self.data_format == "jsonl" and not updated and not deleted and detect_format(controller.file_path) == "jsonl":
+            append_data(controller.file_path, [record.to_dict() for record in added])
+            return
+        
+        save_data(controller.file_path, [record.to_dict() for record in controller.data], self.data_format, self.index)
+
+
+# Get the storage backend selected in settings
+def get_backend():
+    settings = load_settings()
+    backend = settings.get("storage_backend", "json")
+    data_format = settings.get("storage_format", "json")
+    if data_format not in FORMATS:
+        print(f"Unknown storage format {data_format}, using json")
+        data_format = "json"
+
+    if backend == "sqlite":
+        from lib.utils.sqlite_storage import SqliteStorage
+        return SqliteStorage(settings.get("database_file", "data/projects.db"))
+
+    if backend == "journal":
+        from lib.utils.journal_storage import JournalStorage
+        return JournalStorage(settings.get("journal_compact_bytes", 1_000_000), data_format)
+
+    if backend != "json":
+        print(f"Unknown storage backend {backend}, using json")
+    return JsonStorage(data_format, settings.get("offset_index", False))
\ No newline at end of file
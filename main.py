@@ -1,20 +1,23 @@
 # main.py
 
 # Requires
-from lib.controllers.users_controller import UsersController
-from lib.controllers.projects_controller import ProjectsController
-from lib.controllers.tasks_controller import TasksController
+import contextlib
+import os
+import sys
 from lib.utils.args import create_parser
+from lib.utils import storage, output
 
 
 def main():
     # File paths
-    users_file = "data/users.json"
-    projects_file = "data/projects.json"
-    tasks_file = "data/tasks.json"
+    settings = storage.load_settings()
+    users_file = settings.get("user_file", "data/users.json")
+    projects_file = settings.get("project_file", "data/projects.json")
+    tasks_file = settings.get("task_file", "data/tasks.json")
+    socket_path = settings.get("daemon_socket", "data/pm.sock")
     
     # Create parser and parse arguments
-    parser = create_parser()
+    parser = create_parser(sys.argv[1:])
     args = parser.parse_args()
     
     # If no command provided, show help
@@ -22,104 +25,64 @@ def main():
         parser.print_help()
         return
     
-    # Open controllers with context managers
-    with UsersController(users_file) as users_controller:
-        with ProjectsController(projects_file) as projects_controller:
-            with TasksController(tasks_file) as tasks_controller:
-                
-                # Route commands using match/case
-                match args.command:
-                    
-                    # Add user
-                    case "add-user":
-                        users_controller.add_user({"name": args.name, "email": args.email})
-                    
-                    # List users
-                    case "list-users":
-                        users_controller.list_users()
-                    
-                    # Get user
-                    case "get-user":
-                        users_controller.get_user({"id": args.id}, projects_controller, tasks_controller)
-                    
-                    # Update user
-                    case "update-user":
-                        update_args = {"id": args.id}
-                        if args.name:
-                            update_args["name"] = args.name
-                        if args.email:
-                            update_args["email"] = args.email
-                        users_controller.update_user(update_args)
-                    
-                    # Delete user
-                    case "delete-user":
-                        users_controller.delete_user({"id": args.id})
-                    
-                    # Add project
-                    case "add-project":
-                        projects_controller.add_project({
-                            "assigned_to_id": args.assigned_to_id,
-                            "title": args.title,
-                            "description": args.description,
-                            "due_date": args.due_date
-                        }, users_controller)
-                    
-                    # List projects
-                    case "list-projects":
-                        projects_controller.list_projects(users_controller)
-                    
-                    # Get project
-                    case "get-project":
-                        projects_controller.get_project({"id": args.id}, users_controller, tasks_controller)
-                    
-                    # Update project
-                    case "update-project":
-                        update_args = {"id": args.id}
-                        if args.title:
-                            update_args["title"] = args.title
-                        if args.description:
-                            update_args["description"] = args.description
-                        if args.due_date:
-                            update_args["due_date"] = args.due_date
-                        if args.status:
-                            update_args["status"] = args.status
-                        projects_controller.update_project(update_args)
-                    
-                    # Delete project
-                    case "delete-project":
-                        projects_controller.delete_project({"id": args.id})
+    # Show output through a pager if requested
+    display = output.pager() if args.pager else contextlib.nullcontext()
+    
+    # Hand the command to a running daemon, or run it here if there is none
+    if args.command != "daemon" and os.path.exists(socket_path):
+        from lib.utils import daemon
+        client = daemon.connect(socket_path)
+        if client:
+            # The daemon cannot read this process's stdin
+            if args.command == "batch" and args.file == "-":
+                from lib.utils.commands import batch_lines
+                args.lines = list(batch_lines(args.file))
+            
+            # Paths are resolved here since the daemon may run in another directory
+            for option in ("file", "errors", "database"):
+                value = getattr(args, option, None)
+                if value and value != "-":
+                    setattr(args, option, os.path.abspath(value))
+            with display:
+                daemon.request(client, vars(args))
+            return
+    
+    # Import controllers and handlers only once a command needs them
+    from lib.utils import commands
+    from lib.controllers.users_controller import UsersController
+    from lib.controllers.projects_controller import ProjectsController
+    from lib.controllers.tasks_controller import TasksController
+    
+    # Keep the controllers loaded and serve commands until stopped
+    if args.command == "daemon":
+        from lib.utils import daemon
+        daemon.serve(
+            socket_path,
+            UsersController(users_file),
+            ProjectsController(projects_file),
+            TasksController(tasks_file),
+            settings.get("daemon_flush_seconds", 1.0)
+        )
+        return
+    
+    # Open controllers with context managers, saving changed files in one group commit
+    # A file that cannot be read or written stops the command with nothing saved
+    try:
+        with display, storage.group_commit(), UsersController(users_file) as users_controller:
+            with ProjectsController(projects_file) as projects_controller:
+                with TasksController(tasks_file) as tasks_controller:
                     
-                    # Add task
-                    case "add-task":
-                        tasks_controller.add_task({
-                            "project_id": args.project_id,
-                            "title": args.title
-                        }, projects_controller)
+                    # Run the command's handler
+                    commands.dispatch(args, users_controller, projects_controller, tasks_controller)
+    except storage.StorageError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
 
-                    # List tasks
-                    case "list-tasks":
-                        tasks_controller.list_tasks(projects_controller)
-
-                    # Get task
-                    case "get-task":
-                        tasks_controller.get_task({"id": args.id}, projects_controller)
-
-                    # Update task
-                    case "update-task":
-                        update_args = {"id": args.id}
-                        if args.title:
-                            update_args["title"] = args.title
-                        if args.status:
-                            update_args["status"] = args.status
-                        tasks_controller.update_task(update_args)
-
-                    # Delete task (no changes needed)
-                    case "delete-task":
-                        tasks_controller.delete_task({"id": args.id})
-                    
-                    # Unknown command
-                    case _:
-                        print(f"Unknown command: {args.command}")
+    # Report which files were written
+    if args.verbose:
+        controllers = [users_controller, projects_controller, tasks_controller]
+        saved_files = [controller.file_path for controller in controllers if controller.saved]
+        print(f"Persisted {len(saved_files)} file(s): {', '.join(saved_files) or 'none'}")
 
 
 if __name__ == "__main__":
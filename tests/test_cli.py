@@ -123,4 +123,192 @@ def test_all_commands_registered():
     assert "add-project" in output
     assert "list-projects" in output
     assert "add-task" in output
-    assert "list-tasks" in output
\ No newline at end of file
+    assert "list-tasks" in output
+
+
+# Verbose read-only command should report no files persisted
+def test_verbose_list_users_persists_nothing():
+    stdout, stderr, returncode = run_command('python main.py --verbose list-users')
+    assert returncode == 0
+    assert "Persisted 0 file(s)" in stdout
+
+
+# List users should only read the users file
+def test_list_users_only_loads_users_file(monkeypatch):
+    import main
+    from lib.utils import storage
+
+    opened = []
+    iter_data = storage.iter_data
+
+    def tracking_iter_data(filepath):
+        opened.append(filepath)
+        return iter_data(filepath)
+
+    monkeypatch.setattr(storage, "iter_data", tracking_iter_data)
+    monkeypatch.setattr("sys.argv", ["main.py", "list-users"])
+    main.main()
+    assert opened == ["data/users.json"]
+
+
+# JSON format should print parseable output
+def test_list_users_json_format():
+    stdout, stderr, returncode = run_command('python main.py --format json list-users')
+    assert returncode == 0
+    assert isinstance(json.loads(stdout), list)
+
+
+# Modules imported while running a command, read from -X importtime
+def imported_modules(command):
+    stdout, stderr, returncode = run_command(f'python -X importtime {command}')
+    return {line.split("|")[-1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+
+
+# Help and machine-readable output should start without importing rich or the controllers
+def test_startup_defers_heavy_imports():
+    modules = imported_modules('main.py --help')
+    assert "rich" not in modules
+    assert not any(module.startswith("lib.controllers") for module in modules)
+
+    modules = imported_modules('main.py --format json list-users')
+    assert "rich" not in modules
+
+
+# Every registered command except the daemon itself should have a handler
+def test_every_command_has_handler():
+    from lib.utils.args import COMMANDS
+    from lib.utils.commands import HANDLERS
+    assert set(COMMANDS) - {"daemon"} == set(HANDLERS)
+
+
+# Only the invoked command's parser should be built
+def test_parser_builds_only_invoked_command():
+    from lib.utils.args import COMMANDS, create_parser
+    parser = create_parser(["--format", "json", "get-task", "--id", "abc"])
+    subparsers = parser._subparsers._group_actions[0]
+    assert list(subparsers.choices) == ["get-task"]
+    assert parser.parse_args(["--format", "json", "get-task", "--id", "abc"]).id == "abc"
+
+    # Without a command every parser is built so help lists them all
+    subparsers = create_parser([])._subparsers._group_actions[0]
+    assert list(subparsers.choices) == list(COMMANDS)
+
+
+# Batch should run every operation against one set of controllers and report each
+def test_batch_runs_operations(tmp_path, capsys):
+    import argparse
+    from lib.controllers.users_controller import UsersController
+    from lib.controllers.projects_controller import ProjectsController
+    from lib.controllers.tasks_controller import TasksController
+    from lib.utils import commands, storage
+
+    operations = tmp_path / "operations.txt"
+    operations.write_text(
+        'add-user --name "Ada Lovelace" --email ada@example.com\n'
+        '# Comments and blank lines are skipped\n'
+        '\n'
+        '{"command": "add-user", "name": "Grace Hopper", "email": "grace@example.com"}\n'
+        'add-user --name "Ada Again" --email ada@example.com\n'
+        'add-task --title "No project"\n'
+    )
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file) as users_controller:
+        result = commands.dispatch(
+            argparse.Namespace(command="batch", file=str(operations), yes=False),
+            users_controller,
+            ProjectsController(str(tmp_path / "projects.json")),
+            TasksController(str(tmp_path / "tasks.json"))
+        )
+
+    assert result == {"succeeded": 2, "failed": 2}
+    statuses = [line.split("\t")[:3] for line in capsys.readouterr().out.splitlines()]
+    assert statuses == [["1", "ok", "add-user"], ["4", "ok", "add-user"], ["5", "error", "add-user"], ["6", "error", "add-task"]]
+    assert [user["name"] for user in storage.load_data(users_file)] == ["Ada Lovelace", "Grace Hopper"]
+
+
+
+# Import commands should read CSV files and write rejected rows to an errors file
+def test_import_users_command(tmp_path, capsys):
+    import argparse
+    from lib.controllers.users_controller import UsersController
+    from lib.controllers.projects_controller import ProjectsController
+    from lib.controllers.tasks_controller import TasksController
+    from lib.utils import commands, storage
+
+    rows = tmp_path / "users.csv"
+    rows.write_text("name,email\nAda Lovelace,ada@example.com\nBad,not-an-email\nGrace Hopper,grace@example.com\n")
+    users_file = str(tmp_path / "users.json")
+    with storage.group_commit(), UsersController(users_file) as users_controller:
+        imported = commands.dispatch(
+            argparse.Namespace(command="import-users", file=str(rows), input_format=None, errors=None),
+            users_controller,
+            ProjectsController(str(tmp_path / "projects.json")),
+            TasksController(str(tmp_path / "tasks.json"))
+        )
+
+    assert len(imported) == 2
+    assert "Imported 2 users, rejected 1" in capsys.readouterr().out
+    assert [user["email"] for user in storage.load_data(users_file)] == ["ada@example.com", "grace@example.com"]
+    errors = [json.loads(line) for line in (tmp_path / "users.errors.jsonl").read_text().splitlines()]
+    assert errors == [{"line": 3, "error": "Invalid email format.", "row": {"name": "Bad", "email": "not-an-email"}}]
+
+
+# A file that cannot be read to the end should import nothing
+def test_import_read_error_adds_nothing(tmp_path):
+    import argparse
+    from lib.controllers.users_controller import UsersController
+    from lib.controllers.projects_controller import ProjectsController
+    from lib.controllers.tasks_controller import TasksController
+    from lib.utils import commands, storage
+
+    # Enough rows that the bad byte is past the first block read from the file
+    rows = tmp_path / "users.csv"
+    good_rows = "".join(f"User {chr(65 + i % 26)}{chr(65 + i // 26)},user{i}@example.com\n" for i in range(500))
+    rows.write_bytes(("name,email\n" + good_rows).encode("utf-8") + b"Bad \xff Byte,bad@example.com\n")
+    users_file = str(tmp_path / "users.json")
+    with pytest.raises(storage.StorageError, match="Could not read"):
+        with storage.group_commit(), UsersController(users_file) as users_controller:
+            commands.dispatch(
+                argparse.Namespace(command="import-users", file=str(rows), input_format=None, errors=None),
+                users_controller,
+                ProjectsController(str(tmp_path / "projects.json")),
+                TasksController(str(tmp_path / "tasks.json"))
+            )
+
+    assert not os.path.exists(users_file)
+
+
+# Export should join users, projects and tasks, keeping users and projects without children
+# and projects and tasks whose owner was deleted
+def test_export_rows(tmp_path):
+    from lib.controllers.users_controller import UsersController
+    from lib.controllers.projects_controller import ProjectsController
+    from lib.controllers.tasks_controller import TasksController
+    from lib.utils import storage
+    from lib.utils.export import FIELDS, export_rows
+
+    storage.save_data(str(tmp_path / "users.json"), [
+        {"id": "u1", "name": "Ada Lovelace", "email": "ada@example.com"},
+        {"id": "u2", "name": "Grace Hopper", "email": "grace@example.com"}
+    ])
+    storage.save_data(str(tmp_path / "projects.json"), [
+        {"id": "p1", "assigned_to_id": "u1", "title": "Engine", "description": "Notes", "due_date": "12-31-2030", "status": "active"},
+        {"id": "p2", "assigned_to_id": "u1", "title": "Empty", "description": "None yet", "due_date": "12-31-2030", "status": "active"},
+        {"id": "p3", "assigned_to_id": "deleted-user", "title": "Orphan", "description": "Owner gone", "due_date": "12-31-2030", "status": "active"}
+    ])
+    storage.save_data(str(tmp_path / "tasks.json"), [
+        {"id": "t1", "project_id": "p1", "title": "Write program", "status": "active"},
+        {"id": "t2", "project_id": "p1", "title": "Publish", "status": "completed"},
+        {"id": "t3", "project_id": "p3", "title": "Carry on", "status": "active"},
+        {"id": "t4", "project_id": "deleted-project", "title": "Left behind", "status": "active"}
+    ])
+    rows = list(export_rows(
+        UsersController(str(tmp_path / "users.json")),
+        ProjectsController(str(tmp_path / "projects.json")),
+        TasksController(str(tmp_path / "tasks.json"))
+    ))
+
+    assert all(list(row) == FIELDS for row in rows)
+    assert [(row["user_id"], row["project_id"], row["task_id"]) for row in rows] == [
+        ("u1", "p1", "t1"), ("u1", "p1", "t2"), ("u1", "p2", ""), ("u2", "", ""), ("", "p3", "t3"), ("", "", "t4")
+    ]
@@ -0,0 +1,133 @@
+# tests/test_daemon.py
+
+# Requires
+import pytest
+import io
+import json
+import socket
+import threading
+from lib.controllers.users_controller import UsersController
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.models.user import User
+from lib.utils import daemon, storage
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="Unix domain sockets are not available")
+
+
+# Fixture to run a daemon over temporary data files in a background thread
+@pytest.fixture
+def running_daemon(tmp_path):
+    users_file = str(tmp_path / "users.json")
+    storage.save_data(users_file, [{"id": "user-1", "name": "George Heeres", "email": "george@example.com"}])
+    server = daemon.Daemon(
+        str(tmp_path / "pm.sock"),
+        UsersController(users_file),
+        ProjectsController(str(tmp_path / "projects.json")),
+        TasksController(str(tmp_path / "tasks.json")),
+        flush_seconds=60
+    )
+    server.start()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server, users_file
+    server.stop()
+    thread.join()
+
+
+# Helper to send one command to the daemon and capture its output
+def send(server, answer="y", **options):
+    args = {"command": None, "verbose": False, "pager": False, "output_format": "table", **options}
+    stdout = io.StringIO()
+    client = daemon.connect(server.socket_path)
+    assert daemon.request(client, args, stdout=stdout, prompt=lambda text: answer)
+    return stdout.getvalue()
+
+
+# Connecting without a daemon should fall back to direct mode
+def test_connect_without_daemon(tmp_path):
+    assert daemon.connect(str(tmp_path / "missing.sock")) is None
+
+
+# Daemon should serve commands from the data it loaded
+def test_daemon_serves_commands(running_daemon):
+    server, users_file = running_daemon
+    stdout = send(server, command="list-users", output_format="json", limit=None, after=None)
+    assert [user["id"] for user in json.loads(stdout)] == ["user-1"]
+
+
+# Changes should stay in memory until the daemon flushes
+def test_daemon_writes_behind(running_daemon):
+    server, users_file = running_daemon
+    stdout = send(server, command="add-user", name="Ada Lovelace", email="ada@example.com")
+    assert "added successfully" in stdout
+    assert len(storage.load_data(users_file)) == 1
+
+    # Later commands see the unsaved change
+    stdout = send(server, command="get-user", id=None, email="ada@example.com", output_format="json")
+    assert json.loads(stdout)[0]["name"] == "Ada Lovelace"
+
+    server.flush()
+    assert len(storage.load_data(users_file)) == 2
+
+
+# Confirmation prompts should be answered by the client
+def test_daemon_relays_prompts(running_daemon):
+    server, users_file = running_daemon
+    stdout = send(server, answer="n", command="delete-user", id="user-1")
+    assert "Delete cancelled" in stdout
+
+    stdout = send(server, answer="y", command="delete-user", id="user-1")
+    assert "deleted successfully" in stdout
+    assert server.controllers[0].find_by_id("user-1") is None
+
+
+# Stopping the daemon should save pending changes and remove the socket
+def test_daemon_stop_flushes(running_daemon, tmp_path):
+    server, users_file = running_daemon
+    send(server, command="add-user", name="Ada Lovelace", email="ada@example.com")
+    server.stop()
+    assert len(storage.load_data(users_file)) == 2
+    assert daemon.connect(server.socket_path) is None
+
+
+# A malformed request should only end that client's connection
+def test_daemon_survives_bad_request(running_daemon):
+    server, users_file = running_daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(server.socket_path)
+        client.sendall(b"{bad\n")
+        assert client.recv(1024) == b""
+
+    stdout = send(server, command="list-users", output_format="json", limit=None, after=None)
+    assert [user["id"] for user in json.loads(stdout)] == ["user-1"]
+
+
+# A client that stops reading part-way through the output should not stop the daemon
+def test_daemon_survives_closed_client(running_daemon):
+    server, users_file = running_daemon
+    for i in range(20_000):
+        server.controllers[0]._insert(User("George Heeres", f"george{i}@example.com"))
+
+    # Read the first line of a large listing and hang up, like piping into head -1
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(server.socket_path)
+        args = {"command": "list-users", "verbose": False, "pager": False, "output_format": "jsonl", "limit": None, "after": None}
+        client.sendall((json.dumps({"args": args}) + "\n").encode("utf-8"))
+        assert client.makefile("rb").readline()
+
+    stdout = send(server, command="get-user", id="user-1", email=None, output_format="json")
+    assert json.loads(stdout)[0]["name"] == "George Heeres"
+
+
+# The client should stop quietly when its own output is closed
+def test_request_stops_on_broken_stdout(running_daemon):
+    server, users_file = running_daemon
+
+    class ClosedOutput(io.StringIO):
+        def write(self, text):
+            raise BrokenPipeError(32, "Broken pipe")
+
+    args = {"command": "list-users", "verbose": False, "pager": False, "output_format": "json", "limit": None, "after": None}
+    assert daemon.request(daemon.connect(server.socket_path), args, stdout=ClosedOutput())
+    assert "user-1" in send(server, command="list-users", output_format="json", limit=None, after=None)
@@ -5,6 +5,7 @@ import pytest
 from lib.models.user import User
 from lib.models.project import Project
 from lib.models.task import Task
+from lib.models import ids
 
 
 # User should be created with name and email
@@ -161,4 +162,34 @@ def test_task_str():
     )
     result = str(task)
     assert "task-789" in result
-    assert "Answer the riddle of steel" in result
\ No newline at end of file
+    assert "Answer the riddle of steel" in result
+
+
+# Models should use slots instead of a per-instance dictionary
+def test_models_have_no_instance_dict():
+    user = User(name="Valeria", email="valeria@example.com")
+    project = Project(assigned_to_id=user._id, title="Steal the jewel", description="Tower of the Elephant", due_date="12-31-2030")
+    task = Task(project_id=project._id, title="Climb the tower")
+    for record in [user, project, task]:
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.unknown_field = "value"
+
+    # Properties still work on top of the slots
+    user.name = "Valeria of the Red Brotherhood"
+    assert user.to_dict()["name"] == "Valeria of the Red Brotherhood"
+
+
+# UUID IDs should be held as integers and written back as the same text
+def test_uuid_ids_round_trip():
+    data = {"id": "0f8fad5b-d9cb-469f-a165-70867728950e", "project_id": "7c9e6679-7425-40de-944b-e07fc1f90ae7", "title": "Slay the serpent"}
+    task = Task.from_dict(data)
+    assert task._id == 0x0f8fad5bd9cb469fa16570867728950e
+    assert task.project_id == 0x7c9e6679742540de944be07fc1f90ae7
+    assert task.id == data["id"]
+    assert task.to_dict()["project_id"] == data["project_id"]
+
+    # New IDs are integers too, and other text is kept as it was
+    assert isinstance(User(name="Valeria", email="valeria@example.com")._id, int)
+    assert ids.parse("7C9E6679-7425-40DE-944B-E07FC1F90AE7") == "7C9E6679-7425-40DE-944B-E07FC1F90AE7"
+    assert ids.parse(task._id) == task._id
\ No newline at end of file
@@ -0,0 +1,439 @@
+# tests/test_storage.py
+
+# Requires
+import pytest
+import os
+from lib.controllers.users_controller import UsersController
+from lib.controllers.projects_controller import ProjectsController
+from lib.controllers.tasks_controller import TasksController
+from lib.utils import storage, binary_format, offset_index
+from lib.utils.sqlite_storage import SqliteStorage, import_json
+from lib.utils.journal_storage import JournalStorage, log_path
+
+
+# Fixture to create a temporary SQLite database
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "projects.db")
+
+
+# Helper to add a user, project and task through SQLite controllers
+def add_records(database):
+    with UsersController("unused", SqliteStorage(database)) as users_controller:
+        user = users_controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        with ProjectsController("unused", SqliteStorage(database)) as projects_controller:
+            project = projects_controller.add_project({
+                "assigned_to_id": user._id,
+                "title": "Python CLI Project",
+                "description": "Build a project management CLI tool",
+                "due_date": "12-31-2026"
+            }, users_controller)
+            with TasksController("unused", SqliteStorage(database)) as tasks_controller:
+                task = tasks_controller.add_task({
+                    "project_id": project._id,
+                    "title": "Create user model"
+                }, projects_controller)
+    return user, project, task
+
+
+# JSON backend should be the default
+def test_default_backend_is_json():
+    assert isinstance(storage.get_backend(), storage.JsonStorage)
+
+
+# Records added through SQLite should be found without a full load
+def test_sqlite_find_by_id_without_full_load(database):
+    user, project, task = add_records(database)
+    with TasksController("unused", SqliteStorage(database)) as tasks_controller:
+        found = tasks_controller.find_by_id(task._id)
+        assert found.title == "Create user model"
+        assert tasks_controller.find_by_id("invalid-id") is None
+        assert not tasks_controller.loaded
+
+
+# Foreign key and email lookups should query SQLite directly
+def test_sqlite_find_by_foreign_key_and_email(database):
+    user, project, task = add_records(database)
+    with UsersController("unused", SqliteStorage(database)) as users_controller:
+        assert users_controller.find_by_email("GEORGE.HEERES@flatironschool.com")._id == user._id
+        assert not users_controller.loaded
+    with ProjectsController("unused", SqliteStorage(database)) as projects_controller:
+        assert [p._id for p in projects_controller.find_by("assigned_to_id", user._id)] == [project._id]
+    with TasksController("unused", SqliteStorage(database)) as tasks_controller:
+        assert [t._id for t in tasks_controller.find_by("project_id", project._id)] == [task._id]
+        assert not tasks_controller.loaded
+
+
+# Updates and deletes should be written as single rows
+def test_sqlite_update_and_delete(database, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda _: 'y')
+    user, project, task = add_records(database)
+    with TasksController("unused", SqliteStorage(database)) as tasks_controller:
+        tasks_controller.update_task({"id": task._id, "status": "completed"})
+        assert not tasks_controller.loaded
+    with TasksController("unused", SqliteStorage(database)) as tasks_controller:
+        assert tasks_controller.find_by_id(task._id).status == "completed"
+        tasks_controller.delete_task({"id": task._id})
+    with TasksController("unused", SqliteStorage(database)) as tasks_controller:
+        assert len(tasks_controller.data) == 0
+
+
+# Pending adds should show up when the full table is loaded
+def test_sqlite_load_keeps_pending_records(database):
+    user, project, task = add_records(database)
+    with UsersController("unused", SqliteStorage(database)) as users_controller:
+        added = users_controller.add_user({"name": "Thulsa Doom", "email": "thulsa@serpent.com"})
+        assert [u._id for u in users_controller.data] == [user._id, added._id]
+
+
+# Migration should import every JSON file
+def test_import_json(database, tmp_path):
+    user, project, task = add_records(database)
+    files = {}
+    for table, record in [("users", user), ("projects", project), ("tasks", task)]:
+        path = str(tmp_path / f"{table}.json")
+        storage.save_data(path, [record.to_dict()])
+        files[table] = path
+    target = str(tmp_path / "imported.db")
+    counts = import_json(target, files)
+    assert counts == {"users": 1, "projects": 1, "tasks": 1}
+    with UsersController("unused", SqliteStorage(target)) as users_controller:
+        assert users_controller.find_by_id(user._id).name == "George Heeres"
+
+
+# Journal saves should append to the log and replay on load
+def test_journal_appends_and_replays(tmp_path, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda _: 'y')
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file, JournalStorage()) as controller:
+        first = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        second = controller.add_user({"name": "Thulsa Doom", "email": "thulsa@serpent.com"})
+    with UsersController(users_file, JournalStorage()) as controller:
+        controller.update_user({"id": first._id, "name": "George"})
+        controller.delete_user({"id": second._id})
+    assert not os.path.exists(users_file)
+    with open(log_path(users_file)) as file:
+        assert len(file.readlines()) == 4
+    with UsersController(users_file, JournalStorage()) as controller:
+        assert [(u._id, u.name) for u in controller.data] == [(first._id, "George")]
+
+
+# A save after a crash mid-append should not be lost with the partial line
+def test_journal_append_after_partial_line(tmp_path, capsys):
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file, JournalStorage()) as controller:
+        controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+    with open(log_path(users_file), 'a') as file:
+        file.write('{"op": "put", "rec')
+    with UsersController(users_file, JournalStorage()) as controller:
+        controller.add_user({"name": "Valeria", "email": "valeria@cimmeria.com"})
+    capsys.readouterr()
+    with UsersController(users_file, JournalStorage()) as controller:
+        assert [user.name for user in controller.data] == ["George Heeres", "Valeria"]
+    assert "Skipping" not in capsys.readouterr().out
+
+
+# Compaction should fold the log into the snapshot
+def test_journal_compact(tmp_path):
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file, JournalStorage()) as controller:
+        user = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+    with UsersController(users_file, JournalStorage()) as controller:
+        assert controller.backend.compact(controller)
+    assert not os.path.exists(log_path(users_file))
+    assert storage.load_data(users_file) == [user.to_dict()]
+
+
+# A snapshot that fails to write should leave the log in place
+def test_journal_compact_keeps_log_on_error(tmp_path, monkeypatch):
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file, JournalStorage()) as controller:
+        user = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+
+    def failing_write(filepath, payload):
+        raise storage.StorageError(f"Error saving data to {filepath}: No space left on device")
+
+    monkeypatch.setattr(storage, "_write_temp", failing_write)
+    with UsersController(users_file, JournalStorage()) as controller:
+        with pytest.raises(storage.StorageError):
+            with storage.group_commit():
+                controller.backend.compact(controller)
+
+    # Automatic compaction fails after the append, which is already in the log
+    with UsersController(users_file, JournalStorage(compact_bytes=0)) as controller:
+        second = controller.add_user({"name": "Valeria", "email": "valeria@cimmeria.com"})
+    assert os.path.exists(log_path(users_file))
+    assert not os.path.exists(users_file)
+    with UsersController(users_file, JournalStorage()) as controller:
+        assert [record._id for record in controller.data] == [user._id, second._id]
+
+
+# Journal should compact automatically past the size threshold
+def test_journal_automatic_compaction(tmp_path):
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file, JournalStorage(compact_bytes=0)) as controller:
+        controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+    assert not os.path.exists(log_path(users_file))
+    assert len(storage.load_data(users_file)) == 1
+
+
+# Saving should replace the file without leaving temp files behind
+def test_save_data_is_atomic(tmp_path):
+    path = str(tmp_path / "users.json")
+    storage.save_data(path, [{"id": "1"}])
+    storage.save_data(path, [{"id": "2"}])
+    assert storage.load_data(path) == [{"id": "2"}]
+    assert os.listdir(tmp_path) == ["users.json"]
+
+
+# Group commit should only move files into place when the block ends
+def test_group_commit_defers_rename(tmp_path):
+    users_path = str(tmp_path / "users.json")
+    tasks_path = str(tmp_path / "tasks.json")
+    committed = []
+    with storage.group_commit():
+        storage.save_data(users_path, [{"id": "1"}])
+        storage.save_data(tasks_path, [{"id": "2"}])
+        storage.after_commit(lambda: committed.append(True))
+        assert not os.path.exists(users_path)
+        assert not os.path.exists(tasks_path)
+        assert committed == []
+    assert storage.load_data(users_path) == [{"id": "1"}]
+    assert storage.load_data(tasks_path) == [{"id": "2"}]
+    assert committed == [True]
+
+
+# A group that raises should commit nothing and clean up its temp files
+def test_group_commit_discards_on_error(tmp_path):
+    users_path = str(tmp_path / "users.json")
+    storage.save_data(users_path, [{"id": "1"}])
+    committed = []
+    with pytest.raises(RuntimeError):
+        with storage.group_commit():
+            storage.save_data(users_path, [{"id": "2"}])
+            storage.after_commit(lambda: committed.append(True))
+            raise RuntimeError("command failed")
+    assert storage.load_data(users_path) == [{"id": "1"}]
+    assert committed == []
+    assert os.listdir(tmp_path) == ["users.json"]
+
+
+# A file that fails to write should abort the whole group and keep the changes pending
+def test_failed_write_aborts_group(tmp_path, monkeypatch):
+    users_path = str(tmp_path / "users.json")
+    projects_path = str(tmp_path / "projects.json")
+    storage.save_data(users_path, [])
+    storage.save_data(projects_path, [])
+    write_temp = storage._write_temp
+
+    # Fail the way a full disk does, for the projects file only
+    def failing_write(filepath, payload):
+        if filepath == projects_path:
+            raise storage.StorageError(f"Error saving data to {filepath}: No space left on device")
+        return write_temp(filepath, payload)
+
+    monkeypatch.setattr(storage, "_write_temp", failing_write)
+    users_controller = UsersController(users_path, storage.JsonStorage())
+    projects_controller = ProjectsController(projects_path, storage.JsonStorage())
+    with pytest.raises(storage.StorageError):
+        with storage.group_commit(), users_controller:
+            with projects_controller:
+                user = users_controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+                projects_controller.add_project({"assigned_to_id": user.id, "title": "Python CLI Project", "description": "Build a CLI", "due_date": "12-31-2026"}, users_controller)
+    assert storage.load_data(users_path) == []
+    assert storage.load_data(projects_path) == []
+    assert sorted(os.listdir(tmp_path)) == ["projects.json", "users.json"]
+    assert users_controller.dirty and projects_controller.dirty
+    assert not users_controller.saved and not projects_controller.saved
+
+    # The changes are written by the next flush that succeeds
+    monkeypatch.setattr(storage, "_write_temp", write_temp)
+    with storage.group_commit():
+        users_controller.flush()
+        projects_controller.flush()
+    assert len(storage.load_data(users_path)) == 1
+    assert len(storage.load_data(projects_path)) == 1
+    assert not users_controller.dirty and users_controller.saved
+
+
+# Saving should keep the data file's permissions
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_save_data_keeps_mode(tmp_path):
+    path = str(tmp_path / "users.json")
+    storage.save_data(path, [{"id": "1"}])
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    storage.save_data(path, [{"id": "2"}])
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+# Every format should round trip and be detected on load
+@pytest.mark.parametrize("data_format", storage.FORMATS)
+def test_save_and_load_formats(tmp_path, data_format):
+    path = str(tmp_path / "tasks.json")
+    records = [
+        {"id": "1", "project_id": "p1", "title": "Destroy Tower of Serpents", "status": "active"},
+        {"id": "2", "project_id": None, "title": "Kill Thulsa Doom ⚔", "status": "completed"}
+    ]
+    storage.save_data(path, records, data_format)
+    assert storage.load_data(path) == records
+
+
+# Truncated binary files should fail to load instead of losing values
+def test_binary_decode_detects_truncation():
+    payload = binary_format.encode([{"id": "1", "email": "x@example.com"}, {"id": "2", "email": None}])
+    assert binary_format.decode(payload) == [{"id": "1", "email": "x@example.com"}, {"id": "2", "email": None}]
+    for cut in [5, len(payload) - len(binary_format.MAGIC) - 4]:
+        with pytest.raises(ValueError, match="truncated"):
+            binary_format.decode(payload[:-cut])
+
+
+# A data file that cannot be loaded should stop the command before anything is saved over it
+def test_load_error_stops_save(tmp_path):
+    path = str(tmp_path / "users.json")
+    storage.save_data(path, [{"id": str(i), "name": "George Heeres", "email": f"user{i}@example.com"} for i in range(100)], "binary")
+    with open(path, 'rb') as file:
+        payload = file.read()[:-10]
+    with open(path, 'wb') as file:
+        file.write(payload)
+
+    with pytest.raises(storage.StorageError, match="truncated"):
+        with storage.group_commit(), UsersController(path, storage.JsonStorage("binary")) as controller:
+            controller.add_user({"name": "Ada Lovelace", "email": "ada@example.com"})
+    with open(path, 'rb') as file:
+        assert file.read() == payload
+    assert os.listdir(tmp_path) == ["users.json"]
+
+
+# Compact and binary files should be smaller than pretty JSON
+def test_compact_formats_are_smaller(tmp_path):
+    records = [{"id": str(i), "project_id": "p1", "title": f"Task {i}", "status": "active"} for i in range(100)]
+    sizes = {}
+    for data_format in storage.FORMATS:
+        path = str(tmp_path / f"{data_format}.data")
+        storage.save_data(path, records, data_format)
+        sizes[data_format] = os.path.getsize(path)
+    assert sizes["compact"] < sizes["json"]
+    assert sizes["binary"] < sizes["compact"]
+
+
+# Controllers should keep the configured format when saving
+def test_json_storage_uses_format(tmp_path):
+    users_file = str(tmp_path / "users.json")
+    with UsersController(users_file, storage.JsonStorage("binary")) as controller:
+        controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+    with open(users_file, 'rb') as file:
+        assert file.read().startswith(binary_format.MAGIC)
+    with UsersController(users_file) as controller:
+        assert controller.data[0].name == "George Heeres"
+
+
+# JSON Lines files should be read one record at a time
+def test_iter_data_streams_jsonl(tmp_path):
+    path = str(tmp_path / "tasks.jsonl")
+    storage.save_data(path, [{"id": "1"}, {"id": "2"}], "jsonl")
+    records = storage.iter_data(path)
+    assert next(records) == {"id": "1"}
+    assert next(records) == {"id": "2"}
+    assert storage.detect_format(path) == "jsonl"
+
+
+# A partial last line from a crash should be skipped
+def test_iter_data_skips_partial_line(tmp_path, capsys):
+    path = str(tmp_path / "tasks.jsonl")
+    with open(path, 'w') as file:
+        file.write('{"id": "1"}\n{"id": "2", "ti')
+    assert storage.load_data(path) == [{"id": "1"}]
+    assert "Skipping unreadable line 2" in capsys.readouterr().out
+
+
+# An unreadable line before the last should fail the load rather than drop the record
+def test_iter_data_rejects_damaged_line(tmp_path):
+    path = str(tmp_path / "tasks.jsonl")
+    with open(path, 'w') as file:
+        file.write('{"id": "1"}\n{"id": "2", "ti\n{"id": "3"}\n')
+    with pytest.raises(storage.StorageError, match="line 2"):
+        storage.load_data(path)
+
+
+# Adding records to a JSON Lines file should append without rewriting
+def test_jsonl_add_appends_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda _: 'y')
+    users_file = str(tmp_path / "users.jsonl")
+    with UsersController(users_file, storage.JsonStorage("jsonl")) as controller:
+        first = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+    inode = os.stat(users_file).st_ino
+    with UsersController(users_file, storage.JsonStorage("jsonl")) as controller:
+        second = controller.add_user({"name": "Thulsa Doom", "email": "thulsa@serpent.com"})
+    assert os.stat(users_file).st_ino == inode
+    assert [record["id"] for record in storage.load_data(users_file)] == [first.id, second.id]
+
+    # Deletes still rewrite the file
+    with UsersController(users_file, storage.JsonStorage("jsonl")) as controller:
+        controller.delete_user({"id": first._id})
+    assert [record["id"] for record in storage.load_data(users_file)] == [second.id]
+
+
+# Appends should wait for the group commit and not join a partial last line
+def test_jsonl_append_after_partial_line(tmp_path):
+    path = str(tmp_path / "users.jsonl")
+    storage.save_data(path, [{"id": "1"}], "jsonl")
+    with open(path, 'a') as file:
+        file.write('{"id": "2", "na')
+    with storage.group_commit():
+        storage.append_data(path, [{"id": "3"}])
+        assert storage.load_data(path) == [{"id": "1"}]
+    assert storage.load_data(path) == [{"id": "1"}, {"id": "3"}]
+
+
+# Offset index should find single records in every text format
+@pytest.mark.parametrize("data_format", ["json", "compact", "jsonl"])
+def test_offset_index_lookup(tmp_path, data_format):
+    path = str(tmp_path / "tasks.json")
+    records = [{"id": str(i), "title": f"Task {i}"} for i in range(50)]
+    storage.save_data(path, records, data_format, index=True)
+    assert offset_index.lookup(path, "17") == (True, {"id": "17", "title": "Task 17"})
+    assert offset_index.lookup(path, "missing") == (True, None)
+
+
+# Offset index should be ignored once the data file changes
+def test_offset_index_detects_stale_file(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage.save_data(path, [{"id": "1"}], index=True)
+    storage.save_data(path, [{"id": "1"}, {"id": "2"}])
+    assert offset_index.lookup(path, "1") == (False, None)
+
+
+# Get task should decode only the requested records through the index
+def test_get_task_uses_offset_index(tmp_path):
+    projects_file = str(tmp_path / "projects.json")
+    tasks_file = str(tmp_path / "tasks.json")
+    storage.save_data(projects_file, [{"id": "p1", "assigned_to_id": "u1", "title": "Python CLI Project",
+                                       "description": "Build a CLI", "due_date": "12-31-2026", "status": "active"}], index=True)
+    storage.save_data(tasks_file, [{"id": str(i), "project_id": "p1", "title": f"Task {i}", "status": "active"}
+                                   for i in range(20)], index=True)
+    with ProjectsController(projects_file, storage.JsonStorage(index=True)) as projects_controller:
+        with TasksController(tasks_file, storage.JsonStorage(index=True)) as tasks_controller:
+            task = tasks_controller.get_task({"id": "7"}, projects_controller)
+            assert task.title == "Task 7"
+            assert not tasks_controller.loaded
+            assert not projects_controller.loaded
+
+
+# SQLite pages should come from the ordered ID index and include pending adds
+def test_sqlite_page(database):
+    user, project, task = add_records(database)
+    with UsersController("unused", SqliteStorage(database)) as controller:
+        second = controller.add_user({"name": "Thulsa Doom", "email": "thulsa@serpent.com"})
+        third = controller.add_user({"name": "Valeria", "email": "valeria@cimmeria.com"})
+        ordered = sorted([user.id, second.id, third.id])
+        page, cursor = controller.page(limit=2)
+        assert [user.id for user in page] == ordered[:2]
+        assert cursor == ordered[1]
+        page, cursor = controller.page(limit=2, after=cursor)
+        assert [user.id for user in page] == ordered[2:]
+        assert cursor is None
+        assert not controller.loaded
\ No newline at end of file
@@ -4,12 +4,15 @@
 import pytest
 import tempfile
 import os
+import json
 from lib.controllers.users_controller import UsersController
 from lib.controllers.projects_controller import ProjectsController
 from lib.controllers.tasks_controller import TasksController
 from lib.models.user import User
 from lib.models.project import Project
 from lib.models.task import Task
+from lib.models.status import Status
+from lib.utils import output, storage
 
 
 # Fixture to create temporary files for testing
@@ -301,4 +304,180 @@ def test_delete_task_not_found(temp_files, capsys):
                 deleted = tasks_controller.delete_task({"id": "invalid-id"})
                 assert deleted is None
                 captured = capsys.readouterr()
-                assert "not found" in captured.out
\ No newline at end of file
+                assert "not found" in captured.out
+
+
+# Finding tasks by project should follow adds and deletes
+def test_find_by_project_id(temp_files, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda _: 'y')
+    users_file, projects_file, tasks_file = temp_files
+    with UsersController(users_file) as users_controller:
+        user = users_controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        with ProjectsController(projects_file) as projects_controller:
+            project = projects_controller.add_project({
+                "assigned_to_id": user._id,
+                "title": "Python CLI Project",
+                "description": "Build a project management CLI tool",
+                "due_date": "12-31-2026"
+            }, users_controller)
+            assert projects_controller.find_by("assigned_to_id", user._id) == [project]
+            with TasksController(tasks_file) as tasks_controller:
+                first = tasks_controller.add_task({"project_id": project._id, "title": "Create user model"}, projects_controller)
+                second = tasks_controller.add_task({"project_id": project._id, "title": "Create project model"}, projects_controller)
+                assert tasks_controller.find_by("project_id", project._id) == [first, second]
+                tasks_controller.delete_task({"id": first._id})
+                assert tasks_controller.find_by("project_id", project._id) == [second]
+                assert tasks_controller.find_by("project_id", "invalid-id") == []
+
+
+# Listing tasks as JSON Lines should print one record per line
+def test_list_tasks_jsonl(temp_files, capsys):
+    users_file, projects_file, tasks_file = temp_files
+    with UsersController(users_file) as users_controller:
+        user = users_controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        with ProjectsController(projects_file) as projects_controller:
+            project = projects_controller.add_project({
+                "assigned_to_id": user._id,
+                "title": "Python CLI Project",
+                "description": "Build a project management CLI tool",
+                "due_date": "12-31-2026"
+            }, users_controller)
+            with TasksController(tasks_file) as tasks_controller:
+                task = tasks_controller.add_task({"project_id": project._id, "title": "Create user model"}, projects_controller)
+                capsys.readouterr()
+                tasks_controller.list_tasks(projects_controller, {"format": "jsonl"})
+                lines = capsys.readouterr().out.splitlines()
+                assert [json.loads(line) for line in lines] == [{**task.to_dict(), "project": "Python CLI Project"}]
+
+
+# Listing no tasks as CSV should print nothing
+def test_list_tasks_csv_empty(temp_files, capsys):
+    users_file, projects_file, tasks_file = temp_files
+    with UsersController(users_file) as users_controller:
+        with ProjectsController(projects_file) as projects_controller:
+            with TasksController(tasks_file) as tasks_controller:
+                tasks_controller.list_tasks(projects_controller, {"format": "csv"})
+                assert capsys.readouterr().out == ""
+
+
+# Listing more tasks than the stream threshold should print plain rows
+def test_list_tasks_streams_large_tables(temp_files, capsys, monkeypatch):
+    monkeypatch.setattr(output, "STREAM_THRESHOLD", 2)
+    users_file, projects_file, tasks_file = temp_files
+    with UsersController(users_file) as users_controller:
+        user = users_controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        with ProjectsController(projects_file) as projects_controller:
+            project = projects_controller.add_project({
+                "assigned_to_id": user._id,
+                "title": "Python CLI Project",
+                "description": "Build a project management CLI tool",
+                "due_date": "12-31-2026"
+            }, users_controller)
+            with TasksController(tasks_file) as tasks_controller:
+                for title in ["Create user model", "Create project model", "Create task model"]:
+                    tasks_controller.add_task({"project_id": project._id, "title": title}, projects_controller)
+                capsys.readouterr()
+                tasks_controller.list_tasks(projects_controller)
+                lines = capsys.readouterr().out.splitlines()
+                assert lines[0] == "All Tasks"
+                assert lines[2].split() == ["ID", "Title", "Project", "Status"]
+                assert len(lines) == 7
+                assert "Create task model" in lines[6] and "Python CLI Project" in lines[6]
+
+
+# Bulk import should only accept tasks for existing projects
+def test_import_tasks(temp_files, capsys):
+    users_path, projects_path, tasks_path = temp_files
+    with UsersController(users_path) as users_controller:
+        user = users_controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        with ProjectsController(projects_path) as projects_controller:
+            project = projects_controller.add_project({
+                "assigned_to_id": user._id,
+                "title": "Python CLI Project",
+                "description": "Build a project management CLI tool",
+                "due_date": "12-31-2030"
+            }, users_controller)
+            with TasksController(tasks_path) as tasks_controller:
+                rows = [
+                    (1, {"project_id": project.id, "title": "Create task model", "status": "completed"}),
+                    (2, {"project_id": "missing", "title": "Orphan task"}),
+                    (3, {"project_id": project._id, "title": "Bad status", "status": "paused"})
+                ]
+                rejected = []
+                imported = tasks_controller.import_tasks(iter(rows), rejected, projects_controller)
+                assert [(task.title, task.status) for task in imported] == [("Create task model", "completed")]
+                assert [error for line, row, error in rejected] == [
+                    "Project with ID missing not found.",
+                    "Status must be 'active' or 'completed'."
+                ]
+                assert tasks_controller.find_by("project_id", project._id) == imported
+
+
+# Filters, counts and changes should behave the same with the column store
+@pytest.mark.parametrize("columnar", [False, True])
+def test_task_filters_and_stats(temp_files, capsys, columnar):
+    users_path, projects_path, tasks_path = temp_files
+    with open(tasks_path, 'w') as f:
+        json.dump([
+            {"id": "t1", "project_id": "p1", "title": "Sharpen sword", "status": "active"},
+            {"id": "t2", "project_id": "p2", "title": "Find the tower", "status": "completed"},
+            {"id": "t3", "project_id": "p1", "title": "Climb the tower", "status": "completed"},
+            {"id": "t4", "project_id": "p2", "title": "Steal the jewel", "status": "active"}
+        ], f)
+
+    with TasksController(tasks_path, columnar=columnar) as controller:
+        assert controller.status_counts() == {"active": 2, "completed": 2}
+        assert [task._id for task in controller.filter_tasks(status="completed")] == ["t2", "t3"]
+        assert [task._id for task in controller.filter_tasks(status="active", project_id="p2")] == ["t4"]
+        assert [task._id for task in controller.find_by("project_id", "p1")] == ["t1", "t3"]
+
+        # Updates and deletes go through the same controller methods
+        controller.update_task({"id": "t1", "status": "completed"})
+        assert controller.status_counts() == {"active": 1, "completed": 3}
+        controller._remove(controller.find_by_id("t2"))
+        assert [task._id for task in controller.filter_tasks(status="completed")] == ["t1", "t3"]
+        assert controller.find_by_id("t2") is None
+
+        # Filtered listings are paged by ID
+        capsys.readouterr()
+        tasks = controller.list_tasks(ProjectsController(projects_path), {"status": "completed", "limit": 1, "format": "jsonl"})
+        assert [task._id for task in tasks] == ["t1"]
+        assert "--after t1" in capsys.readouterr().err
+        tasks = controller.list_tasks(ProjectsController(projects_path), {"status": "completed", "limit": 1, "after": "t1", "format": "jsonl"})
+        assert [task._id for task in tasks] == ["t3"]
+        assert "--after" not in capsys.readouterr().err
+
+    with open(tasks_path) as f:
+        assert [(task["id"], task["status"]) for task in json.load(f)] == [("t1", "completed"), ("t3", "completed"), ("t4", "active")]
+
+
+# Tasks returned by add and import should be the stored tasks, including in the column store
+@pytest.mark.parametrize("columnar", [False, True])
+def test_added_tasks_are_stored_tasks(temp_files, columnar):
+    users_path, projects_path, tasks_path = temp_files
+    with open(projects_path, 'w') as f:
+        json.dump([{"id": "p1", "assigned_to_id": "u1", "title": "Quest", "description": "Find the jewel", "due_date": "12-31-2030", "status": "active"}], f)
+
+    with ProjectsController(projects_path) as projects_controller:
+        with TasksController(tasks_path, columnar=columnar) as controller:
+            controller.data
+            task = controller.add_task({"project_id": "p1", "title": "Sharpen sword"}, projects_controller)
+            imported, = controller.import_tasks(iter([(1, {"project_id": "p1", "title": "Climb the tower"})]), [], projects_controller)
+            controller.update_task({"id": task.id, "status": "completed"})
+            imported.title = "Climb the tall tower"
+            assert task.status == "completed"
+            assert controller.find_by_id(imported._id).title == "Climb the tall tower"
+
+
+# Loaded tasks should share one object per project ID and per status
+def test_load_shares_repeated_values(temp_files):
+    users_path, projects_path, tasks_path = temp_files
+    project_id = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+    storage.save_data(tasks_path, [
+        {"id": f"task-{i}", "project_id": project_id, "title": f"Task {i}", "status": "completed"} for i in range(3)
+    ])
+    with TasksController(tasks_path) as controller:
+        first, *others = controller.data
+        assert first.status is Status.COMPLETED and first.status == "completed"
+        assert all(task.project_id is first.project_id and task.status is first.status for task in others)
+        assert controller.data[0].to_dict()["project_id"] == project_id
\ No newline at end of file
@@ -188,4 +188,130 @@ def test_delete_user_not_found(temp_users_file, capsys):
         deleted = controller.delete_user({"id": "invalid-id"})
         assert deleted is None
         captured = capsys.readouterr()
-        assert "not found" in captured.out
\ No newline at end of file
+        assert "not found" in captured.out
+
+
+# Controller with no changes should not rewrite its file
+def test_unchanged_controller_skips_save(temp_users_file):
+    with UsersController(temp_users_file) as controller:
+        controller.list_users()
+        assert not controller.dirty
+    assert not controller.saved
+
+
+# Controller with changes should save on exit
+def test_changed_controller_saves(temp_users_file):
+    with UsersController(temp_users_file) as controller:
+        controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        assert controller.dirty
+    assert controller.saved
+    with UsersController(temp_users_file) as controller:
+        assert len(controller.data) == 1
+
+
+# Adding and deleting the same user should leave nothing to save
+def test_add_then_delete_is_not_dirty(temp_users_file, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda _: 'y')
+    with UsersController(temp_users_file) as controller:
+        user = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        controller.delete_user({"id": user._id})
+        assert not controller.dirty
+
+
+# Finding user by ID should follow adds and deletes
+def test_find_by_id(temp_users_file, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda _: 'y')
+    with UsersController(temp_users_file) as controller:
+        user = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        assert controller.find_by_id(user._id) is user
+        controller.delete_user({"id": user._id})
+        assert controller.find_by_id(user._id) is None
+    with UsersController(temp_users_file) as controller:
+        assert controller.find_by_id(user._id) is None
+
+
+# Adding user with same email in different case should fail
+def test_add_user_duplicate_email_case_insensitive(temp_users_file, capsys):
+    with UsersController(temp_users_file) as controller:
+        controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        user = controller.add_user({"name": "George Heeres", "email": "George.Heeres@FlatironSchool.com"})
+        assert user is None
+        captured = capsys.readouterr()
+        assert "already exists" in captured.out
+
+
+# Getting user by email should succeed
+def test_get_user_by_email(temp_users_file, capsys):
+    with UsersController(temp_users_file) as controller:
+        user = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        found = controller.get_user({"email": "GEORGE.HEERES@flatironschool.com"})
+        assert found is user
+        missing = controller.get_user({"email": "nobody@example.com"})
+        assert missing is None
+        captured = capsys.readouterr()
+        assert "email nobody@example.com not found" in captured.out
+
+
+# Updating email should move the user in the email index
+def test_update_user_email_updates_index(temp_users_file):
+    with UsersController(temp_users_file) as controller:
+        user = controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        controller.update_user({"id": user._id, "email": "george@example.com"})
+        assert controller.find_by_email("george@example.com") is user
+        assert controller.find_by_email("george.heeres@flatironschool.com") is None
+
+
+# Listing users with a limit should page through users ordered by ID
+def test_list_users_pagination(temp_users_file, capsys):
+    with UsersController(temp_users_file) as controller:
+        for name in ["Conan", "Valeria", "Subotai", "Akiro", "Osric"]:
+            controller.add_user({"name": name, "email": f"{name.lower()}@cimmeria.com"})
+        ordered = sorted(user.id for user in controller.data)
+
+        first_page = controller.list_users({"limit": 2})
+        assert [user.id for user in first_page] == ordered[:2]
+        assert f"--after {ordered[1]}" in capsys.readouterr().out
+
+        last_page = controller.list_users({"limit": 2, "after": ordered[3]})
+        assert [user.id for user in last_page] == ordered[4:]
+        assert "Next page" not in capsys.readouterr().out
+
+
+# Imported IDs that are not UUIDs should page in text order with generated ones
+def test_list_users_pagination_mixed_ids(temp_users_file):
+    with UsersController(temp_users_file) as controller:
+        rows = [(1, {"id": "legacy-7", "name": "Akiro", "email": "akiro@cimmeria.com"}), (2, {"id": "0-first", "name": "Osric", "email": "osric@cimmeria.com"})]
+        controller.import_users(iter(rows), [])
+        controller.add_user({"name": "Conan", "email": "conan@cimmeria.com"})
+        ordered = sorted(user.id for user in controller.data)
+
+        first_page, cursor = controller.page(limit=2)
+        assert [user.id for user in first_page] == ordered[:2]
+        last_page, cursor = controller.page(limit=2, after=cursor)
+        assert [user.id for user in last_page] == ordered[2:]
+        assert cursor is None
+
+
+# Bulk import should add valid rows and collect the rest with reasons
+def test_import_users(temp_users_file, capsys):
+    with UsersController(temp_users_file) as controller:
+        controller.add_user({"name": "George Heeres", "email": "george.heeres@flatironschool.com"})
+        capsys.readouterr()
+        rows = [
+            (2, {"name": "Ada Lovelace", "email": "ada@example.com"}),
+            (3, {"name": "", "email": "blank@example.com"}),
+            (4, {"name": "George Again", "email": "GEORGE.HEERES@flatironschool.com"}),
+            (5, {"name": "Ada Twice", "email": "ada@example.com"}),
+            (6, {"id": "user-6", "name": "Grace Hopper", "email": "grace@example.com"})
+        ]
+        rejected = []
+        imported = controller.import_users(iter(rows), rejected)
+        assert [user.name for user in imported] == ["Ada Lovelace", "Grace Hopper"]
+        assert controller.find_by_id("user-6").email == "grace@example.com"
+        assert [(line, error) for line, row, error in rejected] == [
+            (3, "Name cannot be empty."),
+            (4, "User with email GEORGE.HEERES@flatironschool.com already exists."),
+            (5, "User with email ada@example.com already exists.")
+        ]
+        # Imports print nothing per row
+        assert capsys.readouterr().out == ""
\ No newline at end of file